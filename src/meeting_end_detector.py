@@ -4,6 +4,7 @@ Enhanced meeting end detection with screenshot capture and clean exit.
 Detects when meetings end and performs graceful cleanup.
 """
 import asyncio
+import re
 from pathlib import Path
 from datetime import datetime, timezone
 from typing import Optional
@@ -12,9 +13,13 @@ from playwright.async_api import Page, TimeoutError as PlaywrightTimeoutError
 
 from .config import get_settings
 from .logging_utils import get_logger
+from .participant_name_filter import clean_participant_name
 
 logger = get_logger(__name__)
 
+# First run of digits in a badge label/text, e.g. "People (2)" or just "2"
+_DIGITS_RE = re.compile(r"\d+")
+
 
 class MeetingEndDetector:
     """Enhanced meeting end detection for Google Meet and Teams."""
@@ -379,8 +384,6 @@ class MeetingEndDetector:
                 return False  # Meeting is NOT empty (badge shows participants)
             
             # Filter to get ONLY real participants (exclude bot/user)
-            from .participant_name_filter import clean_participant_name
-            
             real_participants = []
             bot_participants = []
             
@@ -539,18 +542,15 @@ class MeetingEndDetector:
                 try:
                     badge = await page.query_selector(selector)
                     if badge:
-                        # Get aria-label or text content
+                        # Get aria-label, then text content only if the label has no number
                         aria_label = await badge.get_attribute("aria-label") or ""
-                        badge_text = await badge.inner_text() or ""
-                        
-                        # Extract number from text (e.g., "People (2)" or just "2")
-                        import re
-                        all_text = f"{aria_label} {badge_text}"
-                        matches = re.findall(r'\d+', all_text)
+                        match = _DIGITS_RE.search(aria_label)
+                        if not match:
+                            badge_text = await badge.inner_text() or ""
+                            match = _DIGITS_RE.search(badge_text)
                         
-                        if matches:
-                            count = int(matches[0])
-                            return count
+                        if match:
+                            return int(match.group())
                 except Exception:
                     continue
             
@@ -562,15 +562,13 @@ class MeetingEndDetector:
                     badge_number = await people_button.query_selector('span, div')
                     if badge_number:
                         badge_text = await badge_number.inner_text()
-                        import re
-                        match = re.search(r'\d+', badge_text)
+                        match = _DIGITS_RE.search(badge_text)
                         if match:
                             return int(match.group())
                     
                     # Also check the button's text directly
                     button_text = await people_button.inner_text()
-                    import re
-                    match = re.search(r'\d+', button_text)
+                    match = _DIGITS_RE.search(button_text)
                     if match:
                         return int(match.group())
             except Exception:
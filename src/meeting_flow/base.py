@@ -1,7 +1,12 @@
 from abc import ABC, abstractmethod
-from typing import List, Protocol
+from typing import Iterable, List, Protocol
 
-from playwright.async_api import Page
+from playwright.async_api import Locator, Page
+
+from ..logging_utils import get_logger
+
+
+logger = get_logger(__name__)
 
 
 class MeetingFlow(ABC):
@@ -28,4 +33,36 @@ class EventPublisher(Protocol):
     async def publish_event(self, event_type: str, payload: dict) -> None: ...
 
 
+def first_visible(page: Page, selector: str) -> Locator:
+    """Locator for the first visible element matching ``selector`` (a comma union matches in DOM order)."""
+    return page.locator(f"{selector} >> visible=true").first
+
+
+async def wait_for_visible(page: Page, selector: str, timeout: int) -> bool:
+    """Wait until an element matching ``selector`` is visible; return False on timeout."""
+    try:
+        await first_visible(page, selector).wait_for(state="visible", timeout=timeout)
+        return True
+    except Exception:
+        return False
+
+
+async def click_first_visible(page: Page, selector: str, label: str, timeout: int = 2000) -> bool:
+    """Click the first visible element matching ``selector``; return whether one was clicked."""
+    try:
+        btn = first_visible(page, selector)
+        if await btn.count():
+            await btn.click(timeout=timeout)
+            logger.debug(f"Clicked {label} via selector: {selector}")
+            return True
+    except Exception:
+        pass
+    return False
+
 
+async def click_first_match(page: Page, selectors: Iterable[str], label: str, timeout: int = 2000) -> bool:
+    """Click the first visible match trying ``selectors`` in priority order (a union would use DOM order)."""
+    for selector in selectors:
+        if await click_first_visible(page, selector, label, timeout=timeout):
+            return True
+    return False
@@ -1,3 +1,5 @@
+import asyncio
+import logging
 from pathlib import Path
 from typing import List
 from datetime import datetime, timezone
@@ -7,51 +9,115 @@ from playwright.async_api import Page, TimeoutError as PlaywrightTimeoutError
 from ..cookie_manager import get_cookie_manager
 from ..events import event_publisher
 from ..logging_utils import get_logger
-from .base import MeetingFlow
+from ..participant_name_filter import clean_participant_name
+from .base import MeetingFlow, click_first_match, first_visible
 
 
 logger = get_logger(__name__)
 
 
+# Google Meet usually uses buttons with aria labels or data attributes.
+MIC_SELECTORS = (
+    '[aria-label*="Turn off microphone"]',
+    '[aria-label*="Microphone"]',
+    'button[data-is-muted="false"][aria-label*="microphone"]',
+)
+CAM_SELECTORS = (
+    '[aria-label*="Turn off camera"]',
+    '[aria-label*="Camera"]',
+    'button[data-is-muted="false"][aria-label*="camera"]',
+)
+
+PREJOIN_BUTTON_SELECTORS = (
+    'button:has-text("Microphone allowed")',
+    'button:has-text("Camera and microphone allowed")',
+    'button:has-text("Allow")',
+    '[role="button"]:has-text("Microphone allowed")',
+    '[role="button"]:has-text("Camera and microphone allowed")',
+)
+CLOSE_SELECTORS = (
+    'button[aria-label="Close"]',
+    'button[aria-label*="Close"]',
+    '[aria-label="Close"]',
+    'button:has([aria-label="Close"])',
+    'button[class*="close"]',
+)
+# `text="..."` selectors cannot be comma-joined, so use the equivalent :text-is().
+SIGN_IN_SELECTORS = (
+    ':text-is("Sign in")',
+    ':text-is("Sign In")',
+    '[aria-label*="Sign in"]',
+    '[aria-label*="Sign In"]',
+    'a[href*="accounts.google.com"]',
+)
+JOIN_BUTTON_SELECTORS = (
+    'button:has-text("Join now")',
+    'button:has-text("Ask to join")',
+    'button:has-text("Join")',
+    '[aria-label*="Join now"]',
+    '[aria-label*="Ask to join"]',
+    '[aria-label*="Join meeting"]',
+    '[aria-label*="Join"]',
+    '[jsname="Qx7uuf"]',  # Common Google Meet join button
+    'button[data-tooltip*="Join"]',
+    'div[role="button"]:has-text("Join now")',
+    'div[role="button"]:has-text("Ask to join")',
+    '[data-mdc-dialog-action="join"]',
+    'button.joining',
+)
+
+# Comma-joined unions let the browser resolve a whole selector list in one query.
+# A union matches in DOM order, not list order, so where the list order is a
+# priority (join, mic/camera, dialog close) it is only used to wait, never to pick.
+_PREJOIN_BUTTON_UNION = ", ".join(PREJOIN_BUTTON_SELECTORS)
+_SIGN_IN_UNION = ", ".join(SIGN_IN_SELECTORS)
+_JOIN_BUTTON_UNION = ", ".join(JOIN_BUTTON_SELECTORS)
+
+_MEETING_ENDED_JS = """
+() => {
+    if (!location.href.includes('meet.google.com')) return true;
+    const text = document.body ? document.body.innerText : '';
+    return text.includes('You left the meeting') || text.includes('Meeting ended');
+}
+"""
+
+# Collects People panel names in one round-trip: `named` holds data-self-name
+# attributes, `items` the best name found inside other list items.
+_PEOPLE_PANEL_SEL = '[data-self-name], [role="listitem"], [data-participant-id]'
+_READ_PEOPLE_PANEL_JS = """
+els => {
+    const named = [];
+    const items = [];
+    for (const el of els) {
+        const selfName = el.getAttribute('data-self-name');
+        if (selfName !== null) {
+            named.push(selfName);
+            continue;
+        }
+        const nameEl = el.querySelector('[data-self-name], span[dir="auto"], [aria-label]');
+        if (nameEl) {
+            items.push(
+                nameEl.getAttribute('data-self-name')
+                || nameEl.getAttribute('aria-label')
+                || nameEl.innerText
+            );
+        }
+    }
+    return {named, items};
+}
+"""
+
+
 class GoogleMeetFlow(MeetingFlow):
     
     async def _disable_mic_and_camera(self, page: Page) -> None:
         """Disable microphone and camera on the pre-join screen."""
-        # Google Meet usually uses buttons with aria labels or data attributes.
-        mic_selectors = [
-            '[aria-label*="Turn off microphone"]',
-            '[aria-label*="Microphone"]',
-            'button[data-is-muted="false"][aria-label*="microphone"]',
-        ]
-        cam_selectors = [
-            '[aria-label*="Turn off camera"]',
-            '[aria-label*="Camera"]',
-            'button[data-is-muted="false"][aria-label*="camera"]',
-        ]
-        
-        # Disable microphone
-        for selector in mic_selectors:
-            try:
-                btn = await page.query_selector(selector)
-                if btn and await btn.is_visible():
-                    await btn.click()
-                    logger.debug(f"Disabled microphone via selector: {selector}")
-                    break
-            except Exception:
-                continue
-        
-        await page.wait_for_timeout(500)
-        
-        # Disable camera
-        for selector in cam_selectors:
-            try:
-                btn = await page.query_selector(selector)
-                if btn and await btn.is_visible():
-                    await btn.click()
-                    logger.debug(f"Disabled camera via selector: {selector}")
-                    break
-            except Exception:
-                continue
+        # The two toggles are independent, so probe and click them concurrently.
+        await asyncio.gather(
+            click_first_match(page, MIC_SELECTORS, "microphone toggle"),
+            click_first_match(page, CAM_SELECTORS, "camera toggle"),
+            return_exceptions=True,
+        )
 
     async def _handle_prejoin_permissions(self, page: Page) -> None:
         """Handle Google Meet pre-join mic/camera permission dialog."""
@@ -144,34 +210,23 @@ class GoogleMeetFlow(MeetingFlow):
             
             # Strategy 2: Try CSS selectors if text-based didn't work
             if not clicked:
-                button_selectors = [
-                    'button:has-text("Microphone allowed")',
-                    'button:has-text("Camera and microphone allowed")',
-                    'button:has-text("Allow")',
-                    '[role="button"]:has-text("Microphone allowed")',
-                    '[role="button"]:has-text("Camera and microphone allowed")',
-                ]
-                
-                for selector in button_selectors:
-                    try:
-                        btn = await page.query_selector(selector)
-                        if btn and await btn.is_visible():
-                            await btn.click()
-                            button_text = await btn.inner_text()
-                            logger.info(
-                                f"✅ Clicked permissions dialog button via selector: {button_text}",
-                                extra={
-                                    "extra_data": {
-                                        "meeting_id": self.meeting_id,
-                                        "session_id": self.session_id,
-                                        "selector": selector,
-                                    }
-                                },
-                            )
-                            clicked = True
-                            break
-                    except Exception:
-                        continue
+                try:
+                    btn = first_visible(page, _PREJOIN_BUTTON_UNION)
+                    if await btn.count():
+                        button_text = await btn.inner_text()
+                        await btn.click(timeout=2000)
+                        logger.info(
+                            f"✅ Clicked permissions dialog button via selector: {button_text}",
+                            extra={
+                                "extra_data": {
+                                    "meeting_id": self.meeting_id,
+                                    "session_id": self.session_id,
+                                }
+                            },
+                        )
+                        clicked = True
+                except Exception:
+                    pass
             
             # Strategy 3: Fallback - find any button in the dialog and click it
             if not clicked:
@@ -203,23 +258,17 @@ class GoogleMeetFlow(MeetingFlow):
             if not clicked:
                 try:
                     # Try to find and click the close (X) button
-                    close_selectors = [
-                        'button[aria-label="Close"]',
-                        'button[aria-label*="Close"]',
-                        '[aria-label="Close"]',
-                        'button:has([aria-label="Close"])',
-                        'button[class*="close"]',
-                    ]
-                    for selector in close_selectors:
-                        close_btn = await page.query_selector(selector)
-                        if close_btn and await close_btn.is_visible():
-                            await close_btn.click()
+                    for selector in CLOSE_SELECTORS:
+                        close_btn = first_visible(page, selector)
+                        if await close_btn.count():
+                            await close_btn.click(timeout=2000)
                             logger.info(
                                 "⚠️ Closed permissions dialog via Close (X) button",
                                 extra={
                                     "extra_data": {
                                         "meeting_id": self.meeting_id,
                                         "session_id": self.session_id,
+                                        "selector": selector,
                                     }
                                 },
                             )
@@ -308,7 +357,7 @@ class GoogleMeetFlow(MeetingFlow):
         # Check for "can't join" error or sign-in requirement
         needs_sign_in = False
         
-        if "can't join" in page_content or "you can't join" in page_content:
+        if "can't join" in page_content:
             # Check if it's a sign-in issue or other error
             sign_in_links = await page.query_selector_all('a[href*="accounts.google.com"], text=/sign.*in/i')
             if sign_in_links:
@@ -327,22 +376,15 @@ class GoogleMeetFlow(MeetingFlow):
                 )
                 raise ValueError(error_msg)
         
-        # Check for sign-in prompts (avoid invalid combined selector)
-        sign_in_selectors = [
-            'text="Sign in"',
-            'text="Sign In"',
-            '[aria-label*="Sign in"]',
-            '[aria-label*="Sign In"]',
-            'a[href*="accounts.google.com"]',
-        ]
-        for selector in sign_in_selectors:
+        # Check for sign-in prompts. A "can't join" banner was settled above, so
+        # only probe when the URL points at the Google sign-in wall; the
+        # already-signed-in fast path skips the round-trip entirely.
+        if not needs_sign_in and "accounts.google.com" in page.url:
             try:
-                el = await page.query_selector(selector)
-                if el:
+                if await page.locator(_SIGN_IN_UNION).count():
                     needs_sign_in = True
-                    break
             except Exception:
-                continue
+                pass
         
         # If sign-in is needed, wait for manual sign-in and then continue
         if needs_sign_in:
@@ -370,10 +412,14 @@ class GoogleMeetFlow(MeetingFlow):
                 await page.reload(wait_until="domcontentloaded", timeout=10000)
                 await page.wait_for_timeout(2000)
                 
-                # Check if sign-in is still needed
-                new_content = (await page.content()).lower()
-                has_sign_in = "sign in" in new_content or "can't join" in new_content
-                has_meeting_ui = "join" in new_content or "microphone" in new_content or "camera" in new_content
+                # Check if sign-in is still needed - the URL is cheap, so only
+                # fetch page content once we have left the accounts page
+                if "accounts.google.com" in page.url:
+                    has_sign_in, has_meeting_ui = True, False
+                else:
+                    new_content = (await page.content()).lower()
+                    has_sign_in = "sign in" in new_content or "can't join" in new_content
+                    has_meeting_ui = "join" in new_content or "microphone" in new_content or "camera" in new_content
                 
                 if not has_sign_in and has_meeting_ui:
                     logger.info(
@@ -483,50 +529,35 @@ class GoogleMeetFlow(MeetingFlow):
         await self._handle_prejoin_permissions(page)
         await page.wait_for_timeout(1000)
         
-        # Try multiple join button selectors with timeouts - more comprehensive list
-        join_button_selectors = [
-            'button:has-text("Join now")',
-            'button:has-text("Ask to join")',
-            'button:has-text("Join")',
-            '[aria-label*="Join now"]',
-            '[aria-label*="Ask to join"]',
-            '[aria-label*="Join meeting"]',
-            '[aria-label*="Join"]',
-            '[jsname="Qx7uuf"]',  # Common Google Meet join button
-            'button[data-tooltip*="Join"]',
-            'div[role="button"]:has-text("Join now")',
-            'div[role="button"]:has-text("Ask to join")',
-            '[data-mdc-dialog-action="join"]',
-            'button.joining',
-        ]
-        
+        # Wait once for any of the join button selectors to become visible,
+        # then pick in priority order so "Join now" wins over broad matches
         join_success = False
         last_error = None
         
-        for selector in join_button_selectors:
-            try:
-                # Wait for selector with longer timeout
-                btn = await page.wait_for_selector(selector, timeout=10000, state="visible")
-                if btn and await btn.is_visible():
-                    # Scroll into view if needed
-                    await btn.scroll_into_view_if_needed()
-                    await page.wait_for_timeout(500)
-                    await btn.click()
-                    logger.info(
-                        f"Clicked join button: {selector}",
-                        extra={
-                            "extra_data": {
-                                "meeting_id": self.meeting_id,
-                                "session_id": self.session_id,
-                                "selector": selector,
-                            }
-                        },
-                    )
-                    join_success = True
-                    break
-            except Exception as e:
-                last_error = str(e)
-                continue
+        try:
+            await first_visible(page, _JOIN_BUTTON_UNION).wait_for(state="visible", timeout=10000)
+            for selector in JOIN_BUTTON_SELECTORS:
+                btn = first_visible(page, selector)
+                if not await btn.count():
+                    continue
+                # Scroll into view if needed
+                await btn.scroll_into_view_if_needed()
+                await page.wait_for_timeout(500)
+                await btn.click()
+                logger.info(
+                    f"Clicked join button: {selector}",
+                    extra={
+                        "extra_data": {
+                            "meeting_id": self.meeting_id,
+                            "session_id": self.session_id,
+                            "selector": selector,
+                        }
+                    },
+                )
+                join_success = True
+                break
+        except Exception as e:
+            last_error = str(e)
         
         # Try alternative: Click by coordinates if button found but not clickable
         if not join_success:
@@ -661,15 +692,8 @@ class GoogleMeetFlow(MeetingFlow):
             )
             await detector.wait_for_meeting_end(page)
         except Exception:
-            # Fallback to simple detection
-            while True:
-                url = page.url
-                if "meet.google.com" not in url:
-                    break
-                content = await page.content()
-                if "You left the meeting" in content or "Meeting ended" in content:
-                    break
-                await page.wait_for_timeout(5000)
+            # Fallback to simple detection, polled in-page
+            await page.wait_for_function(_MEETING_ENDED_JS, polling=2000, timeout=0)
 
     async def read_participants(self, page: Page) -> List[dict]:
         """
@@ -684,15 +708,17 @@ class GoogleMeetFlow(MeetingFlow):
             participants = await robust_extractor.extract_participants(page)
             
             if participants:
-                logger.info(
-                    f"ROBUST extraction found {len(participants)} participants",
-                    extra={
-                        "extra_data": {
-                            "participant_count": len(participants),
-                            "participants": [p.get("name") for p in participants],
-                        }
-                    },
-                )
+                if logger.isEnabledFor(logging.INFO):
+                    participant_count = len(participants)
+                    logger.info(
+                        f"ROBUST extraction found {participant_count} participants",
+                        extra={
+                            "extra_data": {
+                                "participant_count": participant_count,
+                                "participants": [p.get("name") for p in participants],
+                            }
+                        },
+                    )
                 return participants
         except Exception as e:
             logger.warning(f"Robust extractor failed, using fallback: {e}")
@@ -718,59 +744,42 @@ class GoogleMeetFlow(MeetingFlow):
         except PlaywrightTimeoutError:
             return []
 
-        await page.wait_for_timeout(2000)  # Wait longer for panel to load
+        # Wait for the panel to render instead of sleeping a fixed interval
+        try:
+            await page.wait_for_selector('[data-self-name],[role="listitem"]', timeout=5000)
+        except Exception:
+            pass
         
         participants: List[dict] = []
         
-        # Strategy 1: Look for participant items with data-self-name attribute (most reliable)
+        # Resolve both strategies' raw names in a single in-page pass
         try:
-            elements_with_name = await page.query_selector_all('[data-self-name]')
-            for el in elements_with_name:
-                try:
-                    name = await el.get_attribute("data-self-name")
-                    if name and name.strip():
-                        from ..participant_name_filter import clean_participant_name
-                        cleaned_name = clean_participant_name(name)
-                        if cleaned_name:
-                            participants.append({"name": cleaned_name})
-                except Exception:
-                    continue
+            raw = await page.locator(_PEOPLE_PANEL_SEL).evaluate_all(_READ_PEOPLE_PANEL_JS)
         except Exception:
-            pass
+            raw = {"named": [], "items": []}
         
-        # Strategy 2: If no results, try list items
-        if not participants:
-            try:
-                elements = await page.query_selector_all('[role="listitem"], [data-participant-id]')
-                for el in elements:
-                    try:
-                        # Try to find name element within list item
-                        name_el = await el.query_selector('[data-self-name], span[dir="auto"], [aria-label]')
-                        if name_el:
-                            name = (
-                                await name_el.get_attribute("data-self-name")
-                                or await name_el.get_attribute("aria-label")
-                                or await name_el.inner_text()
-                            )
-                            if name and name.strip():
-                                from ..participant_name_filter import clean_participant_name
-                                cleaned_name = clean_participant_name(name)
-                                if cleaned_name:
-                                    participants.append({"name": cleaned_name})
-                    except Exception:
-                        continue
-            except Exception:
-                pass
+        # Strategy 1: data-self-name attribute (most reliable);
+        # Strategy 2: if no results, names found inside list items
+        for names in (raw["named"], raw["items"]):
+            for name in names:
+                if name and name.strip():
+                    cleaned_name = clean_participant_name(name)
+                    if cleaned_name:
+                        participants.append({"name": cleaned_name})
+            if participants:
+                break
         
-        logger.debug(
-            f"Extracted {len(participants)} participants",
-            extra={
-                "extra_data": {
-                    "participant_count": len(participants),
-                    "participants": [p.get("name") for p in participants],
-                }
-            },
-        )
+        if logger.isEnabledFor(logging.DEBUG):
+            participant_count = len(participants)
+            logger.debug(
+                f"Extracted {participant_count} participants",
+                extra={
+                    "extra_data": {
+                        "participant_count": participant_count,
+                        "participants": [p.get("name") for p in participants],
+                    }
+                },
+            )
         
         return participants
 
@@ -8,11 +8,14 @@ This flow:
 - Provides detailed error messages with screenshots
 - Validates login state before attempting join
 """
+import logging
 from typing import List
 from playwright.async_api import Page
 
 from ..google_meet.join_meeting import GoogleMeetJoinFlow, GoogleMeetJoinError
 from ..logging_utils import get_logger
+from ..participant_extractor import ParticipantExtractor
+from ..participant_extractor_robust import RobustParticipantExtractor
 from .base import MeetingFlow
 
 
@@ -25,6 +28,9 @@ class GoogleMeetFlowEnhanced(MeetingFlow):
     def __init__(self, meeting_id: str, session_id: str):
         super().__init__(meeting_id, session_id)
         self.join_flow = GoogleMeetJoinFlow(meeting_id, session_id)
+        # Participants are polled for the whole meeting, so build the extractors once
+        self._robust_extractor = RobustParticipantExtractor()
+        self._fallback_extractor = ParticipantExtractor(platform="gmeet")
     
     async def join_meeting(self, page: Page, meeting_url: str) -> None:
         """
@@ -112,29 +118,27 @@ class GoogleMeetFlowEnhanced(MeetingFlow):
         """
         # Use robust extractor first
         try:
-            from ..participant_extractor_robust import RobustParticipantExtractor
-            robust_extractor = RobustParticipantExtractor()
-            participants = await robust_extractor.extract_participants(page)
+            participants = await self._robust_extractor.extract_participants(page)
             
             if participants:
-                logger.info(
-                    f"ROBUST extraction found {len(participants)} participants",
-                    extra={
-                        "extra_data": {
-                            "participant_count": len(participants),
-                            "participants": [p.get("name") for p in participants],
-                        }
-                    },
-                )
+                if logger.isEnabledFor(logging.INFO):
+                    participant_count = len(participants)
+                    logger.info(
+                        f"ROBUST extraction found {participant_count} participants",
+                        extra={
+                            "extra_data": {
+                                "participant_count": participant_count,
+                                "participants": [p.get("name") for p in participants],
+                            }
+                        },
+                    )
                 return participants
         except Exception as e:
             logger.warning(f"Robust extractor failed, using fallback: {e}")
         
         # Fallback to original extractor
         try:
-            from ..participant_extractor import ParticipantExtractor
-            extractor = ParticipantExtractor(platform="gmeet")
-            participants = await extractor.extract_participants(page)
+            participants = await self._fallback_extractor.extract_participants(page)
             return participants
         except Exception as e:
             logger.warning(f"Original extractor also failed: {e}")
@@ -1,37 +1,57 @@
+import asyncio
 from typing import List
 
-from playwright.async_api import Page
+from playwright.async_api import Frame, Page
 
 from ..logging_utils import get_logger
-from .base import MeetingFlow
+from .base import MeetingFlow, click_first_match, first_visible
 
 
 logger = get_logger(__name__)
 
+# Teams web UI – common selectors. Toggle and join lists are in priority order
+# and tried one by one; the others are pre-joined so each probe is one DOM query
+_MIC_SELECTORS = (
+    '[aria-label*="Mute"]',
+    '[aria-label*="Microphone"]',
+    'button[data-tid="prejoin-toggle-mute"]',
+)
+_CAM_SELECTORS = (
+    '[aria-label*="Turn camera off"]',
+    '[aria-label*="Camera"]',
+    'button[data-tid="prejoin-toggle-video"]',
+)
+# Some Teams links first show a "Continue on this browser" button
+_CONTINUE_SEL = ",".join([
+    'a:has-text("Continue on this browser")',
+    'button:has-text("Continue on this browser")',
+])
+_JOIN_SELECTORS = (
+    'button:has-text("Join now")',
+    'button:has-text("Join")',
+)
+_PEOPLE_BUTTON_SEL = ",".join([
+    '[aria-label*="Participants"]',
+    'button[data-tid="participant-button"]',
+])
+_CALL_ENDED_SEL = ",".join([
+    '[data-tid="call-ended-screen"]',
+    ':text("Call ended")',
+    ':text("You left")',
+])
+# Reads every list item's name in-page instead of awaiting each element
+_PARTICIPANT_NAMES_JS = """
+els => els.map(el => {
+    const nameEl = el.querySelector('[data-tid="participant-name"], [aria-label]');
+    return nameEl ? (nameEl.getAttribute('aria-label') || nameEl.innerText) : null;
+})
+"""
+
 
 class TeamsFlow(MeetingFlow):
     async def _disable_mic_and_camera(self, page: Page) -> None:
-        # Teams web UI – common selectors for mic/camera toggles
-        mic_selectors = [
-            '[aria-label*="Mute"]',
-            '[aria-label*="Microphone"]',
-            'button[data-tid="prejoin-toggle-mute"]',
-        ]
-        cam_selectors = [
-            '[aria-label*="Turn camera off"]',
-            '[aria-label*="Camera"]',
-            'button[data-tid="prejoin-toggle-video"]',
-        ]
-        for selector in mic_selectors:
-            btn = await page.query_selector(selector)
-            if btn:
-                await btn.click()
-                break
-        for selector in cam_selectors:
-            btn = await page.query_selector(selector)
-            if btn:
-                await btn.click()
-                break
+        await click_first_match(page, _MIC_SELECTORS, "microphone toggle")
+        await click_first_match(page, _CAM_SELECTORS, "camera toggle")
 
     async def join_meeting(self, page: Page, meeting_url: str) -> None:
         logger.info(
@@ -46,70 +66,55 @@ class TeamsFlow(MeetingFlow):
         )
         await page.goto(meeting_url, wait_until="networkidle")
 
-        # Some Teams links first show a "Continue on this browser" button
-        continue_selectors = [
-            'a:has-text("Continue on this browser")',
-            'button:has-text("Continue on this browser")',
-        ]
-        for selector in continue_selectors:
-            link = await page.query_selector(selector)
-            if link:
-                await link.click()
-                break
+        link = first_visible(page, _CONTINUE_SEL)
+        if await link.count():
+            await link.click()
 
         await page.wait_for_timeout(3000)
         await self._disable_mic_and_camera(page)
 
-        join_selectors = [
-            'button:has-text("Join now")',
-            'button:has-text("Join")',
-        ]
-        for selector in join_selectors:
-            btn = await page.query_selector(selector)
-            if btn:
-                await btn.click()
-                break
+        await click_first_match(page, _JOIN_SELECTORS, "join button")
 
     async def wait_for_meeting_end(self, page: Page) -> None:
-        # Heuristic: loop until Teams shows "Call ended" or similar,
-        # or page navigates away.
-        while True:
-            url = page.url
-            if "teams.microsoft.com" not in url:
-                break
-            content = await page.content()
-            if "Call ended" in content or "You left" in content:
-                break
-            await page.wait_for_timeout(5000)
+        # Heuristic: wait until Teams shows "Call ended" or similar,
+        # or page navigates away. Both are event-driven, so nothing is polled.
+        if "teams.microsoft.com" not in page.url:
+            return
+        
+        left_teams = asyncio.Event()
+        
+        def on_navigated(frame: Frame) -> None:
+            if frame == page.main_frame and "teams.microsoft.com" not in frame.url:
+                left_teams.set()
+        
+        page.on("framenavigated", on_navigated)
+        waiters = {
+            asyncio.create_task(left_teams.wait()),
+            asyncio.create_task(page.wait_for_selector(_CALL_ENDED_SEL, timeout=0)),
+        }
+        try:
+            done, _ = await asyncio.wait(waiters, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                task.result()
+        finally:
+            # Also runs when the caller cancels us; the selector wait never ends on its own
+            for task in waiters:
+                task.cancel()
+            await asyncio.gather(*waiters, return_exceptions=True)
+            page.remove_listener("framenavigated", on_navigated)
 
     async def read_participants(self, page: Page) -> List[dict]:
         """Attempt to read participant list from the Participants panel."""
         # Open the participants pane
-        people_button_selectors = [
-            '[aria-label*="Participants"]',
-            'button[data-tid="participant-button"]',
-        ]
-        for selector in people_button_selectors:
-            btn = await page.query_selector(selector)
-            if btn:
-                await btn.click()
-                break
+        btn = await page.query_selector(_PEOPLE_BUTTON_SEL)
+        if btn:
+            await btn.click()
 
         await page.wait_for_timeout(1000)
-        elements = await page.query_selector_all(
+        names = await page.locator(
             '[data-tid="participant-list-item"], [role="listitem"]'
-        )
-        participants: List[dict] = []
-        for el in elements:
-            name_el = await el.query_selector('[data-tid="participant-name"], [aria-label]')
-            name = None
-            if name_el:
-                name = (await name_el.get_attribute("aria-label")) or (
-                    await name_el.inner_text()
-                )
-            if name:
-                participants.append({"name": name})
-        return participants
+        ).evaluate_all(_PARTICIPANT_NAMES_JS)
+        return [{"name": name} for name in names if name]
 
 
 
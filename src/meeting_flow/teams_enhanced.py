@@ -3,17 +3,61 @@ Enhanced Microsoft Teams flow with improved participant tracking and meeting end
 
 Uses the new ParticipantTracker and MeetingEndDetector modules.
 """
+import asyncio
 from typing import List
 from playwright.async_api import Page
 
 from ..participant_tracker import ParticipantTracker
 from ..meeting_end_detector import MeetingEndDetector
 from ..logging_utils import get_logger
-from .base import MeetingFlow
+from .base import MeetingFlow, click_first_match, first_visible, wait_for_visible
 
 
 logger = get_logger(__name__)
 
+# Toggle selectors are in priority order and tried one by one; the other
+# lists are also pre-joined so a wait is a single DOM query
+_MIC_SELECTORS = (
+    '[aria-label*="Mute" i]',
+    '[aria-label*="Microphone" i]',
+    'button[data-tid="prejoin-toggle-mute"]',
+    '[data-tid="toggle-mute"]',
+)
+_CAM_SELECTORS = (
+    '[aria-label*="Turn camera off" i]',
+    '[aria-label*="Camera" i]',
+    'button[data-tid="prejoin-toggle-video"]',
+    '[data-tid="toggle-video"]',
+)
+_CONTINUE_SELECTORS = (
+    'a:has-text("Continue on this browser")',
+    'button:has-text("Continue on this browser")',
+    '[aria-label*="Continue on this browser" i]',
+)
+# Priority order: the broad "Join" text match also hits launcher buttons such
+# as "Join on the Teams app", so it is only a last resort
+_JOIN_SELECTORS = (
+    '[data-tid="prejoin-join-button"]',
+    'button:has-text("Join now")',
+    '[aria-label*="Join now" i]',
+    '[aria-label*="Join meeting" i]',
+    'button:has-text("Join")',
+)
+_CONTINUE_SEL = ",".join(_CONTINUE_SELECTORS)
+_JOIN_SEL = ",".join(_JOIN_SELECTORS)
+# Controls that only exist on the pre-join screen; the launcher page's own
+# "Join ..." buttons must not count as the pre-join screen having loaded
+_PREJOIN_ONLY_SEL = ",".join([
+    '[data-tid="prejoin-join-button"]',
+    'button[data-tid="prejoin-toggle-mute"]',
+    'button[data-tid="prejoin-toggle-video"]',
+])
+# Either the launcher ("Continue on this browser") or the pre-join screen itself
+_LANDING_READY_SEL = ",".join([_CONTINUE_SEL, _PREJOIN_ONLY_SEL])
+# Polled after clicking join; mirrors the "/call/" check used to verify the join
+_IN_CALL_JS = """() => location.href.includes('/call/')
+    || !!document.querySelector('[data-tid="hangup-button"], #hangup-button')"""
+
 
 class TeamsFlowEnhanced(MeetingFlow):
     """Enhanced Microsoft Teams flow with improved tracking and detection."""
@@ -29,40 +73,11 @@ class TeamsFlowEnhanced(MeetingFlow):
     
     async def _disable_mic_and_camera(self, page: Page) -> None:
         """Disable microphone and camera on the pre-join screen."""
-        mic_selectors = [
-            '[aria-label*="Mute" i]',
-            '[aria-label*="Microphone" i]',
-            'button[data-tid="prejoin-toggle-mute"]',
-            '[data-tid="toggle-mute"]',
-        ]
-        cam_selectors = [
-            '[aria-label*="Turn camera off" i]',
-            '[aria-label*="Camera" i]',
-            'button[data-tid="prejoin-toggle-video"]',
-            '[data-tid="toggle-video"]',
-        ]
-        
-        # Disable microphone
-        for selector in mic_selectors:
-            try:
-                btn = await page.query_selector(selector)
-                if btn and await btn.is_visible():
-                    await btn.click(timeout=3000)
-                    logger.debug("Disabled microphone in Teams")
-                    break
-            except Exception:
-                continue
-        
-        # Disable camera
-        for selector in cam_selectors:
-            try:
-                btn = await page.query_selector(selector)
-                if btn and await btn.is_visible():
-                    await btn.click(timeout=3000)
-                    logger.debug("Disabled camera in Teams")
-                    break
-            except Exception:
-                continue
+        # The two toggles are independent, so probe and click them concurrently
+        await asyncio.gather(
+            click_first_match(page, _MIC_SELECTORS, "microphone toggle", timeout=3000),
+            click_first_match(page, _CAM_SELECTORS, "camera toggle", timeout=3000),
+        )
     
     async def join_meeting(self, page: Page, meeting_url: str) -> None:
         """Join Microsoft Teams meeting with enhanced error handling."""
@@ -80,60 +95,52 @@ class TeamsFlowEnhanced(MeetingFlow):
         try:
             # Navigate to meeting URL
             await page.goto(meeting_url, wait_until="domcontentloaded", timeout=30000)
-            await page.wait_for_timeout(3000)
-            
-            # Handle "Continue on this browser" button if present
-            continue_selectors = [
-                'a:has-text("Continue on this browser")',
-                'button:has-text("Continue on this browser")',
-                '[aria-label*="Continue on this browser" i]',
-            ]
+            await wait_for_visible(page, _LANDING_READY_SEL, timeout=10000)
             
-            for selector in continue_selectors:
-                try:
-                    link = await page.wait_for_selector(selector, timeout=5000, state="visible")
-                    if link:
-                        await link.click()
-                        await page.wait_for_timeout(2000)
-                        logger.debug("Clicked 'Continue on this browser'")
-                        break
-                except Exception:
-                    continue
+            # Handle "Continue on this browser" button if present - either it or
+            # a pre-join-only control has rendered by now
+            try:
+                link = first_visible(page, _CONTINUE_SEL)
+                if await link.count():
+                    await link.click()
+                    # The launcher stays up until the navigation lands; wait for it to go
+                    await link.wait_for(state="detached", timeout=10000)
+                    logger.debug("Clicked 'Continue on this browser'")
+            except Exception:
+                pass
             
             # Wait for pre-join screen to load
-            await page.wait_for_timeout(2000)
+            await wait_for_visible(page, _PREJOIN_ONLY_SEL, timeout=10000)
             
             # Disable mic and camera
             await self._disable_mic_and_camera(page)
-            await page.wait_for_timeout(1000)
             
             # Click join button
-            join_selectors = [
-                'button:has-text("Join now")',
-                'button:has-text("Join")',
-                '[aria-label*="Join now" i]',
-                '[aria-label*="Join meeting" i]',
-                '[data-tid="prejoin-join-button"]',
-            ]
-            
             join_clicked = False
-            for selector in join_selectors:
+            try:
+                # Wait once under one timeout budget, then pick in priority order;
+                # the union matches in DOM order, so it must not pick the button
+                await first_visible(page, _JOIN_SEL).wait_for(state="visible", timeout=10000)
+            except Exception:
+                pass
+            for selector in _JOIN_SELECTORS:
                 try:
-                    btn = await page.wait_for_selector(selector, timeout=5000, state="visible")
-                    if btn:
-                        await btn.scroll_into_view_if_needed()
-                        await btn.click(timeout=3000)
-                        logger.info(
-                            f"Clicked join button: {selector}",
-                            extra={
-                                "extra_data": {
-                                    "meeting_id": self.meeting_id,
-                                    "session_id": self.session_id,
-                                }
-                            },
-                        )
-                        join_clicked = True
-                        break
+                    btn = first_visible(page, selector)
+                    if not await btn.count():
+                        continue
+                    await btn.scroll_into_view_if_needed()
+                    await btn.click(timeout=3000)
+                    logger.info(
+                        f"Clicked join button: {selector}",
+                        extra={
+                            "extra_data": {
+                                "meeting_id": self.meeting_id,
+                                "session_id": self.session_id,
+                            }
+                        },
+                    )
+                    join_clicked = True
+                    break
                 except Exception:
                     continue
             
@@ -144,7 +151,10 @@ class TeamsFlowEnhanced(MeetingFlow):
                 )
             
             # Wait for join to process
-            await page.wait_for_timeout(3000)
+            try:
+                await page.wait_for_function(_IN_CALL_JS, polling=100, timeout=3000)
+            except Exception:
+                pass
             
             # Verify we're in the meeting
             current_url = page.url.lower()
@@ -3,172 +3,227 @@ Production-grade meeting summary builder.
 
 Generates accurate, clean meeting summaries using ONLY real participant data.
 """
-from typing import Dict, List, Optional
+import logging
+import re
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterator, List, Optional, Pattern, Tuple
 from datetime import datetime, timezone
 
+from .config import get_settings
 from .logging_utils import get_logger
-from .participant_name_filter import is_valid_participant_name, clean_participant_name
+from .participant_name_filter import is_valid_participant_name_cached, clean_participant_name_cached
 
 logger = get_logger(__name__)
 
+_YOU_SUFFIX_RE = re.compile(r'\s*\(you\)\s*$', re.IGNORECASE)
+# Finds "(You)" anywhere without allocating a lowercased copy of the name
+_YOU_TAG_RE = re.compile(r'\(you\)', re.IGNORECASE)
 
-class MeetingSummaryBuilder:
-    """Builds accurate meeting summaries from session data."""
+try:
+    # Optional C extension; parses ISO-8601 (including "Z") far faster than the stdlib
+    from ciso8601 import parse_datetime as _parse_iso_uncached
+except ImportError:
+    _parse_iso_uncached = datetime.fromisoformat
+
+_parse_iso = lru_cache(maxsize=2048)(_parse_iso_uncached)
+
+
+def _get_bot_identifiers() -> FrozenSet[str]:
+    """Lowercased bot names from settings (BOT_DISPLAY_NAME, BOT_GOOGLE_PROFILE_NAME).
+
+    get_settings() is cached for the process; the builder adds no cache of its own.
+    """
+    settings = get_settings()
+    bot_identifiers = set()
+    if hasattr(settings, 'bot_display_name') and settings.bot_display_name:
+        bot_identifiers.add(settings.bot_display_name.lower().strip())
+    if hasattr(settings, 'bot_google_profile_name') and settings.bot_google_profile_name:
+        bot_identifiers.add(settings.bot_google_profile_name.lower().strip())
+    return frozenset(bot_identifiers)
+
+
+@lru_cache(maxsize=8)
+def _get_partial_bot_matcher(bot_identifiers: FrozenSet[str]) -> Tuple[Optional[Pattern[str]], str]:
+    """
+    Precompiled partial-match data for bot identifiers of 3+ chars.
     
-    @staticmethod
-    def build_summary(
-        session_data: Dict,
-        participants_history: Dict[str, Dict],
-        audio_chunks: int,
-        errors: Optional[List[str]] = None,
-    ) -> Dict:
-        """
-        Build clean, accurate meeting summary.
-        
-        Args:
-            session_data: Basic session data (meeting_id, platform, etc.)
-            participants_history: Participant tracking history
-            audio_chunks: Number of audio chunks recorded
-            errors: List of errors (if any)
-            
-        Returns:
-            Clean meeting summary dictionary
-        """
-        # Filter participants - include ALL valid participants (including bot)
-        # But exclude UI elements and invalid names
-        all_participants = []
-        
-        # Get bot identifiers for checking
-        from .config import get_settings
-        settings = get_settings()
-        bot_identifiers = []
-        if hasattr(settings, 'bot_display_name') and settings.bot_display_name:
-            bot_identifiers.append(settings.bot_display_name.lower().strip())
-        if hasattr(settings, 'bot_google_profile_name') and settings.bot_google_profile_name:
-            bot_identifiers.append(settings.bot_google_profile_name.lower().strip())
-        
-        # Get detected bot name from session if available
-        detected_bot_name = session_data.get("bot_name_detected")
-        
-        for name, data in participants_history.items():
-            # Use original name if available, otherwise use name
-            original_name = data.get("original_name", name)
-            display_name = data.get("name", name) or name
-            
-            # CRITICAL: Check if it's the bot using multiple methods
-            is_bot = data.get("is_bot", False)
-            
-            # Check 1: is_bot flag from history
-            if not is_bot:
-                # Check 2: "(You)" in original name
-                if original_name and "(you)" in original_name.lower():
-                    is_bot = True
-                    logger.debug(f"Bot identified via '(You)' in original_name: {original_name}")
-                # Check 3: Match detected bot name
-                elif detected_bot_name and name.lower() == detected_bot_name.lower():
-                    is_bot = True
-                    logger.debug(f"Bot identified via detected_bot_name: {detected_bot_name}")
-                # Check 4: Match bot identifiers (BOT_GOOGLE_PROFILE_NAME, etc.)
-                elif name.lower() in bot_identifiers:
-                    is_bot = True
-                    logger.debug(f"Bot identified via bot_identifiers (exact match): {name}")
-                # Check 5: Partial match with bot identifiers
-                else:
-                    name_lower = name.lower()
-                    for identifier in bot_identifiers:
-                        if len(identifier) >= 3:
-                            if identifier in name_lower or name_lower in identifier:
-                                if len(identifier) >= len(name_lower) * 0.5 or len(name_lower) >= len(identifier) * 0.5:
-                                    is_bot = True
-                                    logger.debug(f"Bot identified via bot_identifiers (partial match): {name} matches {identifier}")
-                                    break
-            
-            # Log if bot was identified
-            if is_bot:
-                logger.debug(f"✅ Participant '{name}' identified as BOT in summary builder")
-            
-            # Clean and validate name
-            cleaned_name = clean_participant_name(display_name)
-            if not cleaned_name:
-                # If cleaning fails, try original name (but remove (You) if present)
-                import re
-                temp_name = re.sub(r'\s*\(you\)$', '', original_name, flags=re.IGNORECASE).strip()
-                cleaned_name = clean_participant_name(temp_name)
-                if not cleaned_name:
-                    continue
-            
-            # Skip if it's a UI element (but NOT if it's the bot)
-            if not is_bot and not is_valid_participant_name(cleaned_name):
-                continue
-            
-            # Build participant record
-            participant_record = {
-                "name": cleaned_name,  # Use cleaned name for display
-                "original_name": original_name,  # Keep original for reference (includes "(You)" if present)
-                "is_bot": is_bot,  # Mark if it's the bot
-                "join_time": data.get("join_time"),
-                "leave_time": data.get("leave_time"),
-                "role": data.get("role", "guest"),
-            }
-            
-            # Calculate time in meeting if both times available
-            if participant_record["join_time"] and participant_record["leave_time"]:
-                try:
-                    join_dt = datetime.fromisoformat(
-                        participant_record["join_time"].replace("Z", "+00:00")
-                    )
-                    leave_dt = datetime.fromisoformat(
-                        participant_record["leave_time"].replace("Z", "+00:00")
-                    )
-                    duration_seconds = int((leave_dt - join_dt).total_seconds())
-                    participant_record["duration_seconds"] = duration_seconds
-                except Exception:
-                    pass
-            
-            all_participants.append(participant_record)
-        
-        # Separate real participants from bot for counting
-        real_participants = [p for p in all_participants if not p.get("is_bot", False)]
-        
-        # Calculate unique participants (excluding bot)
-        unique_participants = len(set(p["name"] for p in real_participants))
-        
-        # CRITICAL: Validate audio_chunks count
-        # Only count valid chunks (not fallback silent WAVs)
-        # audio_chunks should reflect actual recorded audio, not placeholder files
-        validated_audio_chunks = max(0, audio_chunks)  # Ensure non-negative
-        
-        # Get transcript if available
-        transcript = session_data.get("transcript", "")
-        
-        # Build summary
-        summary = {
-            "meeting_id": session_data.get("meeting_id", "unknown"),
-            "platform": session_data.get("platform", "unknown"),
-            "session_id": session_data.get("session_id", "unknown"),
-            "duration_seconds": session_data.get("duration_seconds", 0),
-            "participants": all_participants,  # ALL participants including bot (with is_bot flag)
-            "real_participants": real_participants,  # Only real participants (excluding bot)
-            "unique_participants": unique_participants,
-            "audio_chunks": validated_audio_chunks,  # Only valid chunks
-            "audio_duration_seconds": validated_audio_chunks * 30,  # 30 seconds per chunk
-            "ended_at": session_data.get("ended_at"),
-            "created_at": session_data.get("created_at"),
-            "started_at": session_data.get("started_at"),
-            "status": session_data.get("status", "unknown"),
-            "error": session_data.get("error"),
-        }
-        
-        # Add transcript if available
-        if transcript:
-            summary["transcript"] = transcript
-            summary["transcript_summary"] = transcript[:500]  # First 500 chars as summary
-        
-        # Add errors if any
-        if errors:
-            summary["errors"] = errors
+    Returns a regex alternation that finds any identifier inside a name, and the
+    identifiers joined by NUL so "name inside an identifier" is one substring test.
+    Keyed on the identifiers, so a changed bot identity gets a fresh matcher.
+    """
+    identifiers = sorted(i for i in bot_identifiers if len(i) >= 3)
+    if not identifiers:
+        return None, ""
+    return re.compile("|".join(map(re.escape, identifiers))), "\0".join(identifiers)
+
+
+def _make_record(
+    name: str,
+    data: Dict,
+    bot_names: FrozenSet[str],
+    partial_matcher: Tuple[Optional[Pattern[str]], str],
+) -> Optional[Dict]:
+    """Classify and clean one participants_history entry; None if it should be dropped."""
+    # Use original name if available, otherwise use name
+    original_name = data.get("original_name", name)
+    display_name = data.get("name", name) or name
+    
+    # CRITICAL: Check if it's the bot using multiple methods: the is_bot flag
+    # from history, "(You)" in the original name, or an exact match with the
+    # detected bot name / bot identifiers (BOT_GOOGLE_PROFILE_NAME, etc.)
+    name_lower = name.lower()
+    is_bot = bool(
+        data.get("is_bot", False)
+        or (original_name and _YOU_TAG_RE.search(original_name))
+        or name_lower in bot_names
+    )
+    
+    # Otherwise fall back to a partial match with bot identifiers
+    if not is_bot:
+        partial_re, partial_haystack = partial_matcher
+        if partial_re is not None and (
+            partial_re.search(name_lower) or name_lower in partial_haystack
+        ):
+            is_bot = True
+            logger.debug(f"Bot identified via bot_identifiers (partial match): {name}")
+    
+    # Log if bot was identified
+    if is_bot:
+        logger.debug(f"✅ Participant '{name}' identified as BOT in summary builder")
+    
+    # Clean and validate name
+    cleaned_name = clean_participant_name_cached(display_name)
+    if not cleaned_name:
+        # If cleaning fails, try original name (but remove (You) if present)
+        temp_name = _YOU_SUFFIX_RE.sub('', original_name).strip()
+        # Same input as the first attempt (the common case) cannot clean differently
+        if temp_name == display_name:
+            return None
+        cleaned_name = clean_participant_name_cached(temp_name)
+        if not cleaned_name:
+            return None
+    
+    # Skip if it's a UI element (but NOT if it's the bot)
+    if not is_bot and not is_valid_participant_name_cached(cleaned_name):
+        return None
+    
+    # Build participant record
+    participant_record = {
+        "name": cleaned_name,  # Use cleaned name for display
+        "original_name": original_name,  # Keep original for reference (includes "(You)" if present)
+        "is_bot": is_bot,  # Mark if it's the bot
+        "join_time": data.get("join_time"),
+        "leave_time": data.get("leave_time"),
+        "role": data.get("role", "guest"),
+    }
+    
+    # Calculate time in meeting if both times available
+    join_time = participant_record["join_time"]
+    leave_time = participant_record["leave_time"]
+    if join_time and leave_time:
+        try:
+            # History normally stores ISO strings, but accept datetimes as-is
+            join_dt = join_time if isinstance(join_time, datetime) else _parse_iso(join_time)
+            leave_dt = leave_time if isinstance(leave_time, datetime) else _parse_iso(leave_time)
+            duration_seconds = int((leave_dt - join_dt).total_seconds())
+            participant_record["duration_seconds"] = duration_seconds
+        except (ValueError, TypeError):
+            pass
+    
+    return participant_record
+
+
+def _iter_valid_participants(
+    participants_history: Dict[str, Dict],
+    bot_names: FrozenSet[str],
+    partial_matcher: Tuple[Optional[Pattern[str]], str],
+) -> Iterator[Dict]:
+    """Yield a record for each history entry that survives cleaning and filtering."""
+    make_record = _make_record
+    for name, data in participants_history.items():
+        record = make_record(name, data, bot_names, partial_matcher)
+        if record is not None:
+            yield record
+
+
+def build_summary(
+    session_data: Dict,
+    participants_history: Dict[str, Dict],
+    audio_chunks: int,
+    errors: Optional[List[str]] = None,
+) -> Dict:
+    """
+    Build clean, accurate meeting summary.
+    
+    Args:
+        session_data: Basic session data (meeting_id, platform, etc.)
+        participants_history: Participant tracking history
+        audio_chunks: Number of audio chunks recorded
+        errors: List of errors (if any)
         
-        # Log summary creation with validation info
+    Returns:
+        Clean meeting summary dictionary
+    """
+    # Get bot identifiers for checking (from the process-wide cached settings)
+    bot_identifiers = _get_bot_identifiers()
+    partial_matcher = _get_partial_bot_matcher(bot_identifiers)
+    
+    # Get detected bot name from session if available
+    detected_bot_name = session_data.get("bot_name_detected")
+    bot_names = (
+        bot_identifiers | {detected_bot_name.lower()} if detected_bot_name else bot_identifiers
+    )
+    
+    # Filter participants - include ALL valid participants (including bot)
+    # But exclude UI elements and invalid names
+    all_participants = list(_iter_valid_participants(participants_history, bot_names, partial_matcher))
+    
+    # Separate real participants from bot and collect unique names (excluding bot)
+    real_participants = []
+    seen_names = set()
+    for p in all_participants:
+        if not p["is_bot"]:
+            real_participants.append(p)
+            seen_names.add(p["name"])
+    unique_participants = len(seen_names)
+    
+    # CRITICAL: Validate audio_chunks count
+    # Only count valid chunks (not fallback silent WAVs)
+    # audio_chunks should reflect actual recorded audio, not placeholder files
+    validated_audio_chunks = max(0, audio_chunks)  # Ensure non-negative
+    
+    # Get transcript if available
+    transcript = session_data.get("transcript", "")
+    
+    # Build summary
+    summary = {
+        "meeting_id": session_data.get("meeting_id", "unknown"),
+        "platform": session_data.get("platform", "unknown"),
+        "session_id": session_data.get("session_id", "unknown"),
+        "duration_seconds": session_data.get("duration_seconds", 0),
+        "participants": all_participants,  # ALL participants including bot (with is_bot flag)
+        "real_participants": real_participants,  # Only real participants (excluding bot)
+        "unique_participants": unique_participants,
+        "audio_chunks": validated_audio_chunks,  # Only valid chunks
+        "audio_duration_seconds": validated_audio_chunks * 30,  # 30 seconds per chunk
+        "ended_at": session_data.get("ended_at"),
+        "created_at": session_data.get("created_at"),
+        "started_at": session_data.get("started_at"),
+        "status": session_data.get("status", "unknown"),
+        "error": session_data.get("error"),
+    }
+    
+    # Add transcript if available
+    if transcript:
+        summary["transcript"] = transcript
+        summary["transcript_summary"] = transcript[:500]  # First 500 chars as summary
+    
+    # Add errors if any
+    if errors:
+        summary["errors"] = errors
+    
+    # Log summary creation with validation info
+    if logger.isEnabledFor(logging.INFO):
         logger.info(
             "Meeting summary built",
             extra={
@@ -184,6 +239,19 @@ class MeetingSummaryBuilder:
                 }
             },
         )
-        
-        return summary
+    
+    return summary
 
+
+class MeetingSummaryBuilder:
+    """Builds accurate meeting summaries from session data."""
+    
+    @staticmethod
+    def build_summary(
+        session_data: Dict,
+        participants_history: Dict[str, Dict],
+        audio_chunks: int,
+        errors: Optional[List[str]] = None,
+    ) -> Dict:
+        """Build clean, accurate meeting summary (see module-level build_summary)."""
+        return build_summary(session_data, participants_history, audio_chunks, errors)
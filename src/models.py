@@ -1,10 +1,10 @@
 from datetime import datetime
-from enum import Enum
+from enum import StrEnum
 from typing import Optional
 from pydantic import BaseModel, AnyHttpUrl, Field
 
 
-class Platform(str, Enum):
+class Platform(StrEnum):
     teams = "teams"
     gmeet = "gmeet"
 
@@ -28,7 +28,7 @@ class ErrorResponse(BaseModel):
     code: str
 
 
-class SessionStatus(str, Enum):
+class SessionStatus(StrEnum):
     created = "created"
     joining = "joining"
     in_meeting = "in_meeting"
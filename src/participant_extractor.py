@@ -4,16 +4,106 @@ Production-grade participant extraction for Google Meet and Teams.
 Uses stable DOM selectors and robust filtering to extract ONLY real participant names.
 Filters out all UI elements, notifications, and system text.
 """
+import logging
+import re
+import time
 from typing import List, Dict, Optional
 from datetime import datetime, timezone
 
-from playwright.async_api import Page
+from playwright.async_api import Locator, Page
 
 from .logging_utils import get_logger
-from .participant_name_filter import clean_participant_name, is_valid_participant_name
+from .participant_name_filter import clean_participant_name_cached, is_valid_participant_name_cached
 
 logger = get_logger(__name__)
 
+_HOST_ROLE_RE = re.compile(r"organizer|host")
+
+# In-page readers: resolve names/roles for every element in one round-trip
+# instead of awaiting get_attribute/query_selector per element.
+# Walks each People panel row once and returns one entry per raw name.
+# Rows carrying data-self-name are trusted; the rest are dropped when their
+# text has UI indicators (settings, camera, "your ...", etc.).
+_GMEET_PANEL_JS = """
+() => {
+    const items = new Map();
+    const hostSel = '[aria-label*="host" i], [aria-label*="organizer" i], [aria-label*="presenter" i]';
+    const uiText = /backgrounds|effects|microphone|camera|settings|options|can't|your /;
+    const speakingSel = '[class*="speaking" i], [aria-label*="speaking" i], [data-speaking="true"]';
+    document.querySelectorAll('[role="listitem"], [data-participant-id]').forEach(li => {
+        const selfEl = li.querySelector('[data-self-name]');
+        const nameEl = selfEl || li.querySelector('span[dir="auto"], [aria-label]');
+        if (!nameEl) return;
+        const name = nameEl.getAttribute('data-self-name')
+            || nameEl.getAttribute('aria-label')
+            || nameEl.innerText;
+        if (!name) return;
+        const speaking = li.matches(speakingSel) || !!li.querySelector(speakingSel);
+        const existing = items.get(name);
+        if (existing) {
+            existing.is_speaking = existing.is_speaking || speaking;
+            return;
+        }
+        const text = (li.innerText || '').toLowerCase();
+        if (!selfEl && (!text || uiText.test(text))) return;
+        // data-self-name rows take the role from the host badge; others from row text
+        const isHost = selfEl ? !!selfEl.querySelector(hostSel) : /host|organizer/.test(text);
+        items.set(name, {
+            name,
+            role: isHost ? 'host' : 'guest',
+            is_speaking: speaking,
+        });
+    });
+    return [...items.values()];
+}
+"""
+# Cheap roster snapshot (names, speaking rows, row count); unchanged between
+# polls means the last extraction result is still current.
+_GMEET_ROSTER_FINGERPRINT_JS = """
+() => {
+    const names = Array.from(
+        document.querySelectorAll('[data-self-name]'),
+        el => el.getAttribute('data-self-name')
+    );
+    if (!names.length) return '';
+    const speaking = Array.from(
+        document.querySelectorAll('[class*="speaking" i], [aria-label*="speaking" i], [data-speaking="true"]'),
+        el => {
+            const nameEl = (el.closest('[role="listitem"]') || el).querySelector('[data-self-name]');
+            return nameEl ? nameEl.getAttribute('data-self-name') : '';
+        }
+    );
+    const rows = document.querySelectorAll('[role="listitem"], [data-participant-id]').length;
+    return names.sort().join('|') + '#' + speaking.join('|') + '#' + rows;
+}
+"""
+_TEAMS_ITEMS_JS = """
+els => els.flatMap(item => {
+    const nameEl = item.querySelector('[data-tid="participant-name"], [aria-label]');
+    if (!nameEl) return [];
+    const name = nameEl.getAttribute('aria-label') || nameEl.innerText;
+    if (!name) return [];
+    const roleEl = item.querySelector('[data-tid="participant-role"]');
+    return [{
+        name,
+        role_text: roleEl ? roleEl.innerText : '',
+        is_speaking: !!item.querySelector('[class*="active" i]'),
+    }];
+})
+"""
+_GENERIC_ITEMS_JS = """
+els => els.map(el => {
+    const nameEl = el.querySelector('[aria-label], [data-self-name]');
+    return nameEl
+        ? (nameEl.getAttribute('aria-label') || nameEl.getAttribute('data-self-name') || nameEl.innerText)
+        : null;
+})
+"""
+
+# Rows that show up once the People / participants panel has rendered
+_GMEET_PANEL_ITEMS_SEL = '[data-self-name], [data-participant-id]'
+_TEAMS_PANEL_ITEMS_SEL = '[data-tid="participant-item"], [role="listitem"]'
+
 
 class ParticipantExtractor:
     """
@@ -29,6 +119,34 @@ class ParticipantExtractor:
     
     def __init__(self, platform: str):
         self.platform = platform.lower()
+        # Resolve the platform-specific extractor once instead of on every call
+        self._impl = {
+            "gmeet": self._extract_gmeet_participants,
+            "teams": self._extract_teams_participants,
+        }.get(self.platform, self._extract_generic_participants)
+        # Locators built once per page and reused on every extraction tick
+        self._locators: Optional[Dict[str, Locator]] = None
+        self._locators_page: Optional[Page] = None
+        # Last Google Meet result and the roster fingerprint it was built from
+        self._last_fingerprint: Optional[str] = None
+        self._last_result: List[Dict] = []
+        # Backoff for panels that cannot be opened (e.g. disabled in this meeting)
+        self._panel_retry_at = 0.0
+        self._panel_fails = 0
+    
+    def _bind(self, page: Page) -> Dict[str, Locator]:
+        """Return the cached locators for this page, building them on first use."""
+        if self._locators is None or self._locators_page is not page:
+            self._locators = {
+                "gmeet_panel_items": page.locator(_GMEET_PANEL_ITEMS_SEL),
+                "gmeet_panel_open": page.locator(
+                    '[aria-label*="People" i]:visible, [aria-label*="Show everyone" i]:visible'
+                ),
+                "teams_panel_items": page.locator(_TEAMS_PANEL_ITEMS_SEL),
+                "list_items": page.locator('[role="listitem"]'),
+            }
+            self._locators_page = page
+        return self._locators
     
     async def extract_participants(self, page: Page) -> List[Dict]:
         """
@@ -37,49 +155,41 @@ class ParticipantExtractor:
         Returns:
             List of participant dicts with: name, role, is_speaking
         """
-        if self.platform == "gmeet":
-            return await self._extract_gmeet_participants(page)
-        elif self.platform == "teams":
-            return await self._extract_teams_participants(page)
-        else:
-            return await self._extract_generic_participants(page)
+        return await self._impl(page)
     
     async def _extract_gmeet_participants(self, page: Page) -> List[Dict]:
         """
         CRITICAL: Extract ONLY real participants from Google Meet.
         
-        Uses multiple strategies and HARD FILTERING to ensure UI elements are never included.
+        Reads every People panel row in one pass and applies HARD FILTERING to ensure
+        UI elements are never included.
         """
         participants = []
-        raw_names_seen = []  # For debugging
         
         try:
+            # Reuse the last result while the roster is unchanged (the common case between polls)
+            fingerprint = await self._gmeet_roster_fingerprint(page)
+            if fingerprint and fingerprint == self._last_fingerprint:
+                return [dict(p) for p in self._last_result]
+            
             # Step 1: Ensure People panel is open
             await self._ensure_people_panel_open(page)
-            await page.wait_for_timeout(2000)  # Wait for panel to fully load
+            await self._wait_for_panel_items(self._bind(page)["gmeet_panel_items"])
             
-            # Step 2: Use multiple extraction strategies
-            # Strategy A: Direct data-self-name attributes (most reliable)
-            participants_a = await self._extract_via_data_self_name(page)
+            # Step 2: Read every People panel row in a single pass
+            raw_participants = await self._extract_all_gmeet(page)
             
-            # Strategy B: Participant list items with name spans
-            participants_b = await self._extract_via_list_items(page)
-            
-            # Strategy C: Contributors section
-            participants_c = await self._extract_via_contributors(page)
-            
-            # Merge and deduplicate with STRICT filtering
+            # Deduplicate by cleaned name with STRICT filtering
             all_participants = {}
-            for p_list in [participants_a, participants_b, participants_c]:
-                for p in p_list:
-                    name = p.get("name", "").strip()
-                    raw_names_seen.append(name)  # Track for debugging
-                    
-                    if not name:
-                        continue
-                    
-                    # CRITICAL: Hard filter - must pass validation
-                    if not is_valid_participant_name(name):
+            for p in raw_participants:
+                name = clean_participant_name_cached(p["name"])
+                
+                if not name:
+                    continue
+                
+                # CRITICAL: Hard filter - must pass validation
+                if not is_valid_participant_name_cached(name):
+                    if logger.isEnabledFor(logging.DEBUG):
                         logger.debug(
                             f"Filtered out invalid participant name: {name}",
                             extra={
@@ -90,63 +200,62 @@ class ParticipantExtractor:
                                 }
                             },
                         )
-                        continue
-                    
-                    # Clean the name
-                    cleaned_name = clean_participant_name(name)
-                    if not cleaned_name:
-                        continue
-                    
-                    # Use first occurrence, or merge data
-                    if cleaned_name not in all_participants:
-                        all_participants[cleaned_name] = {
-                            **p,
-                            "name": cleaned_name,  # Use cleaned name
-                        }
-                    else:
-                        # Merge: keep role if available, keep speaking status
-                        existing = all_participants[cleaned_name]
-                        if p.get("role") and not existing.get("role"):
-                            existing["role"] = p["role"]
-                        if p.get("is_speaking"):
-                            existing["is_speaking"] = True
+                    continue
+                
+                # Clean the name
+                cleaned_name = clean_participant_name_cached(name)
+                if not cleaned_name:
+                    continue
+                
+                # Use first occurrence, or merge speaking status
+                existing = all_participants.get(cleaned_name)
+                if existing is None:
+                    all_participants[cleaned_name] = {
+                        "name": cleaned_name,  # Use cleaned name
+                        "role": p["role"],
+                        "is_speaking": p["is_speaking"],
+                    }
+                elif p["is_speaking"]:
+                    existing["is_speaking"] = True
             
             participants = list(all_participants.values())
             
-            # Developer-level logging: Show what was filtered
-            logger.debug(
-                f"DEVELOPER: Participant extraction - {len(raw_names_seen)} raw names, {len(participants)} valid participants",
-                extra={
-                    "extra_data": {
-                        "platform": "gmeet",
-                        "raw_names_count": len(raw_names_seen),
-                        "valid_participants_count": len(participants),
-                        "raw_names": raw_names_seen[:10],  # First 10 for debugging
-                        "valid_names": [p.get("name") for p in participants],
-                    }
-                },
-            )
-            
-            # Step 3: Detect active speaker
-            active_speaker_name = await self._detect_active_speaker_gmeet(page)
-            if active_speaker_name:
-                for p in participants:
-                    if p.get("name") == active_speaker_name:
-                        p["is_speaking"] = True
-                    else:
-                        p["is_speaking"] = False
+            # An empty read (failed evaluate, panel mid-render) must not be served
+            # from cache until the roster changes, so only cache a real roster
+            if participants:
+                self._last_fingerprint = fingerprint
+                self._last_result = [dict(p) for p in participants]
+            else:
+                self._last_fingerprint = None
             
-            logger.debug(
-                f"Extracted {len(participants)} real participants from Google Meet",
-                extra={
-                    "extra_data": {
-                        "participant_count": len(participants),
-                        "participants": [p.get("name") for p in participants],
-                    }
-                },
-            )
+            # Developer-level logging: Show what was filtered
+            if logger.isEnabledFor(logging.DEBUG):
+                raw_names_seen = [p["name"] for p in raw_participants]
+                logger.debug(
+                    f"DEVELOPER: Participant extraction - {len(raw_names_seen)} raw names, {len(participants)} valid participants",
+                    extra={
+                        "extra_data": {
+                            "platform": "gmeet",
+                            "raw_names_count": len(raw_names_seen),
+                            "valid_participants_count": len(participants),
+                            "raw_names": raw_names_seen[:10],  # First 10 for debugging
+                            "valid_names": [p.get("name") for p in participants],
+                        }
+                    },
+                )
+                
+                logger.debug(
+                    f"Extracted {len(participants)} real participants from Google Meet",
+                    extra={
+                        "extra_data": {
+                            "participant_count": len(participants),
+                            "participants": [p.get("name") for p in participants],
+                        }
+                    },
+                )
             
         except Exception as e:
+            self._last_fingerprint = None
             logger.warning(
                 f"Error extracting Google Meet participants: {e}",
                 extra={
@@ -159,212 +268,30 @@ class ParticipantExtractor:
         
         return participants
     
-    async def _extract_via_data_self_name(self, page: Page) -> List[Dict]:
-        """Extract using data-self-name attribute (most reliable)."""
-        participants = []
-        
+    async def _gmeet_roster_fingerprint(self, page: Page) -> str:
+        """Snapshot of the roster and speaking rows; empty when it cannot be read."""
         try:
-            # Find all elements with data-self-name attribute
-            elements = await page.query_selector_all('[data-self-name]')
-            
-            for element in elements:
-                try:
-                    name = await element.get_attribute("data-self-name")
-                    if not name:
-                        continue
-                    
-                    # Clean and validate
-                    cleaned_name = clean_participant_name(name)
-                    if not cleaned_name:
-                        continue
-                    
-                    # Check if this is a participant item (not a button or control)
-                    parent = await element.evaluate_handle("el => el.closest('[role=\"listitem\"]')")
-                    if not parent:
-                        # Not in a list item, might be a control element
-                        continue
-                    
-                    # Extract role
-                    role = "guest"
-                    role_indicators = await element.query_selector_all(
-                        '[aria-label*="host" i], [aria-label*="organizer" i], [aria-label*="presenter" i]'
-                    )
-                    if role_indicators:
-                        role = "host"
-                    
-                    participants.append({
-                        "name": cleaned_name,
-                        "role": role,
-                        "is_speaking": False,
-                    })
-                    
-                except Exception:
-                    continue
-                    
-        except Exception as e:
-            logger.debug(f"Error in _extract_via_data_self_name: {e}")
-        
-        return participants
-    
-    async def _extract_via_list_items(self, page: Page) -> List[Dict]:
-        """Extract from participant list items."""
-        participants = []
-        
-        try:
-            # Find participant list items in People panel
-            list_items = await page.query_selector_all(
-                '[role="listitem"]:has([data-self-name]), '
-                '[role="listitem"]:has(span[dir="auto"]), '
-                '[data-participant-id]'
-            )
-            
-            for item in list_items:
-                try:
-                    # Try to find name element within list item
-                    name_element = await item.query_selector(
-                        '[data-self-name], span[dir="auto"], [aria-label]'
-                    )
-                    
-                    if not name_element:
-                        continue
-                    
-                    # Get name
-                    name = (
-                        await name_element.get_attribute("data-self-name")
-                        or await name_element.get_attribute("aria-label")
-                        or await name_element.inner_text()
-                    )
-                    
-                    if not name:
-                        continue
-                    
-                    # Clean and validate
-                    cleaned_name = clean_participant_name(name)
-                    if not cleaned_name:
-                        continue
-                    
-                    # Check if this is a real participant (not UI element)
-                    # Get full text of list item to check for UI indicators
-                    item_text = await item.inner_text()
-                    if item_text:
-                        item_text_lower = item_text.lower()
-                        # Skip if contains UI indicators
-                        ui_indicators = [
-                            "backgrounds", "effects", "microphone", "camera",
-                            "settings", "options", "can't", "your "
-                        ]
-                        if any(indicator in item_text_lower for indicator in ui_indicators):
-                            continue
-                    
-                    # Extract role
-                    role = "guest"
-                    if "host" in item_text_lower or "organizer" in item_text_lower:
-                        role = "host"
-                    
-                    # Check for speaking indicator
-                    is_speaking = False
-                    speaking_indicators = await item.query_selector_all(
-                        '[class*="speaking" i], [aria-label*="speaking" i]'
-                    )
-                    if speaking_indicators:
-                        is_speaking = True
-                    
-                    participants.append({
-                        "name": cleaned_name,
-                        "role": role,
-                        "is_speaking": is_speaking,
-                    })
-                    
-                except Exception:
-                    continue
-                    
-        except Exception as e:
-            logger.debug(f"Error in _extract_via_list_items: {e}")
-        
-        return participants
+            return await page.evaluate(_GMEET_ROSTER_FINGERPRINT_JS)
+        except Exception:
+            return ""
     
-    async def _extract_via_contributors(self, page: Page) -> List[Dict]:
-        """Extract from Contributors section."""
-        participants = []
-        
+    async def _extract_all_gmeet(self, page: Page) -> List[Dict]:
+        """Read name, role and speaking state (active speaker) of every People panel row."""
         try:
-            # Find Contributors section
-            contributors_section = await page.query_selector(
-                '[aria-label*="Contributors" i], [class*="contributor" i]'
-            )
-            
-            if not contributors_section:
-                return participants
-            
-            # Find participant items within Contributors section
-            items = await contributors_section.query_selector_all(
-                '[role="listitem"], [data-self-name]'
-            )
-            
-            for item in items:
-                try:
-                    name_element = await item.query_selector('[data-self-name], span')
-                    if not name_element:
-                        continue
-                    
-                    name = (
-                        await name_element.get_attribute("data-self-name")
-                        or await name_element.inner_text()
-                    )
-                    
-                    if not name:
-                        continue
-                    
-                    cleaned_name = clean_participant_name(name)
-                    if cleaned_name:
-                        participants.append({
-                            "name": cleaned_name,
-                            "role": "guest",
-                            "is_speaking": False,
-                        })
-                        
-                except Exception:
-                    continue
-                    
+            return await page.evaluate(_GMEET_PANEL_JS)
         except Exception as e:
-            logger.debug(f"Error in _extract_via_contributors: {e}")
-        
-        return participants
-    
-    async def _detect_active_speaker_gmeet(self, page: Page) -> Optional[str]:
-        """Detect active speaker from Google Meet UI."""
-        try:
-            # Look for speaking indicators
-            speaking_elements = await page.query_selector_all(
-                '[class*="speaking" i], [aria-label*="speaking" i], [data-speaking="true"]'
-            )
-            
-            for element in speaking_elements:
-                try:
-                    # Find associated participant name
-                    name_element = await element.query_selector('[data-self-name]')
-                    if name_element:
-                        name = await name_element.get_attribute("data-self-name")
-                        if name:
-                            cleaned = clean_participant_name(name)
-                            if cleaned:
-                                return cleaned
-                except Exception:
-                    continue
-                    
-        except Exception:
-            pass
-        
-        return None
+            logger.debug(f"Error in _extract_all_gmeet: {e}")
+            return []
     
     async def _ensure_people_panel_open(self, page: Page) -> None:
         """Ensure People panel is open."""
+        if time.monotonic() < self._panel_retry_at:
+            return
+        
         try:
             # Check if panel is already open
-            panel_visible = await page.query_selector(
-                '[aria-label*="People" i]:visible, [aria-label*="Show everyone" i]:visible'
-            )
-            if panel_visible:
+            if await self._bind(page)["gmeet_panel_open"].count():
+                self._record_panel_open(True)
                 return
             
             # Try to open panel
@@ -378,15 +305,33 @@ class ParticipantExtractor:
                 try:
                     button = await page.query_selector(selector)
                     if button:
-                        await button.click(timeout=3000)
-                        await page.wait_for_timeout(500)
+                        await button.click(timeout=1000)
+                        self._record_panel_open(True)
                         return
                 except Exception:
                     continue
+            
+            self._record_panel_open(False)
                     
         except Exception:
             pass
     
+    def _record_panel_open(self, opened: bool) -> None:
+        """Reset the panel backoff on success, otherwise double it (capped at 30s)."""
+        if opened:
+            self._panel_fails = 0
+            self._panel_retry_at = 0.0
+        else:
+            self._panel_retry_at = time.monotonic() + min(30, 2 ** self._panel_fails)
+            self._panel_fails += 1
+    
+    async def _wait_for_panel_items(self, panel_items: Locator) -> None:
+        """Wait (best effort, up to 3s) until the panel has rendered at least one row."""
+        try:
+            await panel_items.first.wait_for(state="attached", timeout=3000)
+        except Exception:
+            pass
+    
     async def _extract_teams_participants(self, page: Page) -> List[Dict]:
         """Extract participants from Microsoft Teams."""
         participants = []
@@ -394,53 +339,23 @@ class ParticipantExtractor:
         try:
             # Open participants panel
             await self._ensure_teams_panel_open(page)
-            await page.wait_for_timeout(2000)
+            panel_items = self._bind(page)["teams_panel_items"]
+            await self._wait_for_panel_items(panel_items)
             
-            # Find participant items
-            items = await page.query_selector_all(
-                '[data-tid="participant-item"], [role="listitem"]'
-            )
+            # Read name, role text and speaking state of every item in one call
+            items = await panel_items.evaluate_all(_TEAMS_ITEMS_JS)
             
             for item in items:
-                try:
-                    name_element = await item.query_selector(
-                        '[data-tid="participant-name"], [aria-label]'
-                    )
-                    if not name_element:
-                        continue
-                    
-                    name = (
-                        await name_element.get_attribute("aria-label")
-                        or await name_element.inner_text()
-                    )
-                    
-                    if not name:
-                        continue
+                cleaned_name = clean_participant_name_cached(item["name"])
+                if cleaned_name:
+                    # Extract role
+                    role = "host" if _HOST_ROLE_RE.search(item["role_text"].lower()) else "guest"
                     
-                    cleaned_name = clean_participant_name(name)
-                    if cleaned_name:
-                        # Extract role
-                        role = "guest"
-                        role_element = await item.query_selector('[data-tid="participant-role"]')
-                        if role_element:
-                            role_text = await role_element.inner_text()
-                            if "organizer" in role_text.lower() or "host" in role_text.lower():
-                                role = "host"
-                        
-                        # Check speaking status
-                        is_speaking = False
-                        speaking_indicator = await item.query_selector('[class*="active" i]')
-                        if speaking_indicator:
-                            is_speaking = True
-                        
-                        participants.append({
-                            "name": cleaned_name,
-                            "role": role,
-                            "is_speaking": is_speaking,
-                        })
-                        
-                except Exception:
-                    continue
+                    participants.append({
+                        "name": cleaned_name,
+                        "role": role,
+                        "is_speaking": item["is_speaking"],
+                    })
                     
         except Exception as e:
             logger.warning(f"Error extracting Teams participants: {e}")
@@ -449,6 +364,9 @@ class ParticipantExtractor:
     
     async def _ensure_teams_panel_open(self, page: Page) -> None:
         """Ensure Teams participants panel is open."""
+        if time.monotonic() < self._panel_retry_at:
+            return
+        
         try:
             button_selectors = [
                 '[aria-label*="Show participants"]',
@@ -459,11 +377,13 @@ class ParticipantExtractor:
                 try:
                     button = await page.query_selector(selector)
                     if button:
-                        await button.click(timeout=3000)
-                        await page.wait_for_timeout(500)
+                        await button.click(timeout=1000)
+                        self._record_panel_open(True)
                         return
                 except Exception:
                     continue
+            
+            self._record_panel_open(False)
         except Exception:
             pass
     
@@ -472,26 +392,16 @@ class ParticipantExtractor:
         participants = []
         
         try:
-            elements = await page.query_selector_all('[role="listitem"]')
-            for element in elements:
-                try:
-                    name_element = await element.query_selector('[aria-label], [data-self-name]')
-                    if name_element:
-                        name = (
-                            await name_element.get_attribute("aria-label")
-                            or await name_element.get_attribute("data-self-name")
-                            or await name_element.inner_text()
-                        )
-                        if name:
-                            cleaned = clean_participant_name(name)
-                            if cleaned:
-                                participants.append({
-                                    "name": cleaned,
-                                    "role": "guest",
-                                    "is_speaking": False,
-                                })
-                except Exception:
-                    continue
+            names = await self._bind(page)["list_items"].evaluate_all(_GENERIC_ITEMS_JS)
+            for name in names:
+                if name:
+                    cleaned = clean_participant_name_cached(name)
+                    if cleaned:
+                        participants.append({
+                            "name": cleaned,
+                            "role": "guest",
+                            "is_speaking": False,
+                        })
         except Exception:
             pass
         
@@ -7,8 +7,11 @@ ENHANCED: Better bot/self detection for Google profile login scenarios.
 CRITICAL: Google Meet shows participants in the "Contributors" section of the People panel.
 Each participant is in a [role="listitem"] with a [data-self-name] attribute containing the name.
 """
-from typing import List, Dict, Set, Optional
+from functools import lru_cache
+from typing import List, Dict, Optional, Tuple
+import json
 import re
+import weakref
 from playwright.async_api import Page
 
 from .logging_utils import get_logger
@@ -16,6 +19,67 @@ from .participant_name_filter import is_valid_participant_name, clean_participan
 
 logger = get_logger(__name__)
 
+# data-self-name plus self indicators on its list item (mute-self control,
+# "(you)" text, self/local classes) for every matched element
+_DOM_SELF_NAMES_JS = """
+els => els.map(el => {
+    const listItem = el.closest('[role="listitem"]');
+    let looksLikeSelf = false;
+    if (listItem) {
+        const classList = Array.from(listItem.classList || []).join(' ').toLowerCase();
+        looksLikeSelf = !!listItem.querySelector('[aria-label*="Mute microphone" i], [aria-label*="Turn off microphone" i]')
+            || (listItem.innerText || '').toLowerCase().includes('(you)')
+            || classList.includes('self') || classList.includes('local');
+    }
+    return {name: el.getAttribute('data-self-name'), looks_like_self: looksLikeSelf};
+})
+"""
+
+# "Is the People panel open?" probe, joined so it is one query
+_PANEL_OPEN_SEL = ", ".join(f"{selector}:visible" for selector in (
+    '[aria-label*="People" i][role="dialog"]',
+    '[aria-label*="Show everyone" i]',
+    '[role="dialog"]:has([role="list"])',
+))
+# People panel buttons in priority order; tried one by one, since a union
+# would click whichever comes first in the DOM
+_PEOPLE_BUTTON_SELECTORS = (
+    '[aria-label*="Show everyone" i]',
+    '[aria-label*="People" i]',
+    'button[aria-label*="People" i]',
+    'button[data-tooltip*="People" i]',
+    '[data-tooltip*="Show everyone" i]',
+)
+
+# Participant rows of the People panel, used to wait until it has rendered
+_PANEL_ROWS_SEL = '[role="dialog"][aria-label*="People" i] [role="listitem"], [role="listitem"] [data-self-name]'
+
+# "(You)" suffix Google Meet appends to the local user's (the bot's) name
+_YOU_SUFFIX_RE = re.compile(r'\s*\(you\)$', re.IGNORECASE)
+
+# Reads text, data-self-name and dir="auto" text of every list item in one call
+_PANEL_ITEMS_JS = """
+els => els.map(item => {
+    const selfNameEl = item.querySelector('[data-self-name]');
+    const autoDirEl = item.querySelector('span[dir="auto"], div[dir="auto"]');
+    return {
+        text: item.innerText,
+        self_name: selfNameEl ? selfNameEl.getAttribute('data-self-name') : null,
+        auto_dir_text: autoDirEl ? autoDirEl.innerText : null,
+    };
+})
+"""
+
+# Rows for the DOM-selector and panel-text fallbacks, read together
+_FALLBACK_ROWS_JS = """
+(() => ({
+    dom: (""" + _DOM_SELF_NAMES_JS + """)(Array.from(document.querySelectorAll(
+        '[role="listitem"] [data-self-name], [role="listitem"][data-self-name]'
+    ))),
+    panel: (""" + _PANEL_ITEMS_JS + """)(Array.from(document.querySelectorAll('[role="listitem"]'))),
+}))()
+"""
+
 
 # Extended blacklist for UI elements that should NEVER be treated as participants
 UI_ELEMENT_BLACKLIST = [
@@ -100,12 +164,259 @@ UI_ELEMENT_BLACKLIST = [
     "disable",
 ]
 
+# All blacklist phrases as one alternation, so a single scan replaces the per-phrase loop
+_UI_BLACKLIST_RE = re.compile("|".join(map(re.escape, UI_ELEMENT_BLACKLIST)))
+
+# Comprehensive JavaScript to extract real participants with enhanced bot
+# detection; also reads the participant badge count in the same evaluate, and
+# the fallback rows too when it finds fewer participants than the badge shows
+_EXTRACT_JS = """
+(() => {
+    const participants = [];
+    const seen = new Set();
+    
+    // Extended UI element blacklist, shared with the Python filter
+    const uiBlacklist = """ + json.dumps(UI_ELEMENT_BLACKLIST) + """;
+    // One alternation test instead of a substring scan per blacklist entry
+    const uiBlacklistRe = new RegExp(
+        uiBlacklist.map(item => item.replace(/[.*+?^${}()|[\\]\\\\]/g, '\\\\$&')).join('|')
+    );
+    
+    function isUIElement(text) {
+        if (!text || text.length < 2) return true;
+        const lower = text.toLowerCase().trim();
+        
+        // Check blacklist
+        if (uiBlacklistRe.test(lower)) return true;
+        
+        // Starts with "your" or "you " (notifications)
+        if (lower.startsWith('your ') || lower.startsWith('you ')) return true;
+        
+        // Contains can't/cannot (error messages)
+        if (lower.includes("can't") || lower.includes('cannot')) return true;
+        
+        // Ends with period and is a sentence
+        if (lower.endsWith('.') && lower.split(' ').length > 4) return true;
+        
+        return false;
+    }
+    
+    // ENHANCED: Check multiple indicators for "self" participant (the bot)
+    // innerText forces layout, so callers read it once per item and pass it in
+    function checkIfSelf(element, name, innerText) {
+        // Check 1: "(You)" suffix in name (case-insensitive)
+        if (/\\(you\\)/i.test(name)) {
+            return true;
+        }
+        
+        // Check 2: Element has specific self-indicator classes
+        const classList = Array.from(element.classList || []).join(' ').toLowerCase();
+        if (classList.includes('self') || classList.includes('local') || classList.includes('me')) {
+            return true;
+        }
+        
+        // Check 3: Look for "You" label inside the element
+        const youLabels = element.querySelectorAll('[data-self-name*="(You)"], [data-self-name*="(you)"]');
+        if (youLabels.length > 0) {
+            return true;
+        }
+        
+        // Check 4: Check for aria-label containing "you"
+        const ariaLabel = (element.getAttribute('aria-label') || '').toLowerCase();
+        if (ariaLabel.includes('(you)') || ariaLabel === 'you') {
+            return true;
+        }
+        
+        // Check 5: Check for mute/unmute controls specific to self
+        // Self participants often have "Mute microphone" instead of "Mute [Name]"
+        const muteBtn = element.querySelector('[aria-label*="Mute microphone" i], [aria-label*="Turn off microphone" i]');
+        if (muteBtn) {
+            return true;
+        }
+        
+        // Check 6: Look for pin/unpin self button
+        const pinSelfBtn = element.querySelector('[aria-label*="Pin yourself" i], [aria-label*="Unpin yourself" i]');
+        if (pinSelfBtn) {
+            return true;
+        }
+        
+        // Check 7: Look for text content indicating self
+        if (innerText.toLowerCase().includes('(you)')) {
+            return true;
+        }
+        
+        return false;
+    }
+    
+    function extractName(element, fullText) {
+        // Method 1: data-self-name attribute (most reliable)
+        const selfNameEl = element.querySelector('[data-self-name]');
+        if (selfNameEl) {
+            return selfNameEl.getAttribute('data-self-name');
+        }
+        
+        // Method 2: Look for span with dir="auto" containing the name
+        const spans = element.querySelectorAll('span[dir="auto"], div[dir="auto"]');
+        for (let span of spans) {
+            const text = (span.textContent || '').trim();
+            if (text && text.length > 1 && text.length < 100 && !isUIElement(text)) {
+                return text;
+            }
+        }
+        
+        // Method 3: First line of text (careful filtering)
+        const lines = fullText.split('\\n').map(l => l.trim()).filter(l => l.length > 1);
+        for (let line of lines) {
+            if (!isUIElement(line) && line.length < 100) {
+                return line;
+            }
+        }
+        
+        return null;
+    }
+    
+    // Participant count from the People button badge (shows actual count)
+    function getBadgeCount() {
+        try {
+            // Method 1: Look for People button with badge number
+            const buttons = document.querySelectorAll(
+                'button[aria-label*="people" i], button[aria-label*="show everyone" i], button[aria-label*="participant" i]'
+            );
+            for (let btn of buttons) {
+                // Check for badge number in button content
+                const spans = btn.querySelectorAll('span, div');
+                for (let span of spans) {
+                    const text = (span.textContent || '').trim();
+                    if (/^\\d+$/.test(text)) {
+                        return parseInt(text);
+                    }
+                }
+                // Check aria-label for number
+                const match = btn.getAttribute('aria-label').match(/(\\d+)/);
+                if (match) {
+                    return parseInt(match[1]);
+                }
+            }
+        
+            // Method 2: Look for any element with participant count
+            const countElements = document.querySelectorAll('[data-participant-count]');
+            for (let el of countElements) {
+                const count = el.getAttribute('data-participant-count');
+                if (count) {
+                    return parseInt(count);
+                }
+            }
+        
+            // Method 3: Look for "X in call" or similar text
+            const allText = document.body.innerText || '';
+            const inCallMatch = allText.match(/(\\d+)\\s*(?:in\\s*(?:the\\s*)?(?:call|meeting))/i);
+            if (inCallMatch) {
+                return parseInt(inCallMatch[1]);
+            }
+        
+        } catch (e) {
+            console.error('Badge count error:', e);
+        }
+        return 0;
+    }
+    
+    try {
+        // Strategy 1: Get list items, scoped to the People panel when it is
+        // present so other lists on the page (chat, etc.) are not walked
+        const peoplePanel = document.querySelector('[role="dialog"][aria-label*="People" i]');
+        const listItems = (peoplePanel || document).querySelectorAll('[role="listitem"]');
+        
+        for (let item of listItems) {
+            const itemText = item.innerText || '';
+            const name = extractName(item, itemText);
+            if (name && !isUIElement(name)) {
+                const nameLower = name.toLowerCase().replace(/\\s*\\(you\\)$/i, '').trim().toLowerCase();
+                
+                if (!seen.has(nameLower)) {
+                    seen.add(nameLower);
+                    
+                    // ENHANCED: Use multiple methods to detect if this is the bot
+                    let isBot = checkIfSelf(item, name, itemText);
+                    
+                    // Clean the name - remove (You) suffix
+                    let cleanName = name.trim();
+                    const youPattern = /\\s*\\(you\\)$/i;
+                    if (youPattern.test(cleanName)) {
+                        cleanName = cleanName.replace(youPattern, '').trim();
+                        isBot = true;  // Definitely the bot if has (You)
+                    }
+                    
+                    if (cleanName.length > 1) {
+                        participants.push({
+                            name: cleanName,
+                            originalName: name,
+                            isBot: isBot,
+                            source: 'listitem'
+                        });
+                    }
+                }
+            }
+        }
+        
+        // Strategy 2: Direct data-self-name search (backup)
+        if (participants.length === 0) {
+            const nameElements = document.querySelectorAll('[data-self-name]');
+            for (let el of nameElements) {
+                const name = el.getAttribute('data-self-name');
+                if (name && !isUIElement(name)) {
+                    const listItem = el.closest('[role="listitem"]');
+                    if (listItem) {
+                        const nameLower = name.toLowerCase().replace(/\\s*\\(you\\)$/i, '').trim().toLowerCase();
+                        
+                        if (!seen.has(nameLower)) {
+                            seen.add(nameLower);
+                            
+                            let isBot = checkIfSelf(listItem, name, listItem.innerText || '');
+                            
+                            let cleanName = name.trim();
+                            const youPattern = /\\s*\\(you\\)$/i;
+                            if (youPattern.test(cleanName)) {
+                                cleanName = cleanName.replace(youPattern, '').trim();
+                                isBot = true;
+                            }
+                            
+                            if (cleanName.length > 1) {
+                                participants.push({
+                                    name: cleanName,
+                                    originalName: name,
+                                    isBot: isBot,
+                                    source: 'data-self-name'
+                                });
+                            }
+                        }
+                    }
+                }
+            }
+        }
+        
+    } catch (e) {
+        console.error('JS extraction error:', e);
+    }
+    
+    // parseInt can yield NaN (or a negative from a bad attribute); treat as no badge
+    const rawBadgeCount = getBadgeCount();
+    const badgeCount = Number.isFinite(rawBadgeCount) && rawBadgeCount > 0 ? rawBadgeCount : 0;
+    const result = {badgeCount: badgeCount, participants: participants};
+    if (participants.length < badgeCount) {
+        result.fallbackRows = """ + _FALLBACK_ROWS_JS + """;
+    }
+    return result;
+})()
+"""
+
 
+@lru_cache(maxsize=1024)
 def is_ui_element(text: str) -> bool:
     """
     CRITICAL: Check if text is a UI element, not a real participant name.
     
     This is the PRIMARY filter - if this returns True, the text is NOT a participant.
+    Memoized: the same names and panel headers come back on every extraction.
     """
     if not text or not isinstance(text, str):
         return True
@@ -115,40 +426,38 @@ def is_ui_element(text: str) -> bool:
     if not text_lower:
         return True
     
-    # Check against extended blacklist (case-insensitive)
-    for blacklisted in UI_ELEMENT_BLACKLIST:
-        if blacklisted in text_lower:
-            return True
+    # Cheapest checks first; every check below only ever rejects
     
-    # Additional pattern checks
+    # Too short (single letter, etc.)
+    if len(text_lower) < 2:
+        return True
     
-    # Starts with "your" or "you" (notifications)
-    if text_lower.startswith("your ") or text_lower.startswith("you "):
+    # Too long for a name (likely a message)
+    if len(text) > 100:
         return True
     
-    # Contains "can't" or "cannot" (error messages)
-    if "can't" in text_lower or "cannot" in text_lower:
+    # Must contain at least one letter
+    if not any(c.isalpha() for c in text):
         return True
     
-    # Ends with period and is long (likely a notification message)
-    if text_lower.endswith(".") and len(text_lower.split()) > 4:
+    # Starts with "your" or "you" (notifications)
+    if text_lower.startswith(("your ", "you ")):
         return True
     
-    # Contains multiple sentences (notifications)
-    sentences = [s for s in text_lower.split(".") if s.strip()]
-    if len(sentences) > 2:
+    # Contains "can't" or "cannot" (error messages)
+    if "can't" in text_lower or "cannot" in text_lower:
         return True
     
-    # Too short (single letter, etc.)
-    if len(text_lower) < 2:
+    # Check against extended blacklist (case-insensitive)
+    if _UI_BLACKLIST_RE.search(text_lower):
         return True
     
-    # Too long for a name (likely a message)
-    if len(text) > 100:
+    # Ends with period and is long (likely a notification message)
+    if text_lower.endswith(".") and len(text_lower.split()) > 4:
         return True
     
-    # Must contain at least one letter
-    if not any(c.isalpha() for c in text):
+    # Contains multiple sentences (notifications); more than two need at least two periods
+    if text_lower.count(".") >= 2 and sum(1 for s in text_lower.split(".") if s.strip()) > 2:
         return True
     
     # All caps and contains numbers (likely system text)
@@ -158,6 +467,34 @@ def is_ui_element(text: str) -> bool:
     return False
 
 
+# People panel state per Page, shared by every extractor instance (callers often
+# create one per poll): True while known open, False once watched but stale.
+# Weak keys, so a closed or collected Page drops out instead of being reused.
+_panel_open: "weakref.WeakKeyDictionary[Page, bool]" = weakref.WeakKeyDictionary()
+
+
+def _remember_panel_open(page: Page) -> None:
+    """Skip panel checks for this page until its main frame navigates or it closes."""
+    if page not in _panel_open:
+        # First sighting: register the listeners once per page, never per extractor
+        def on_navigated(frame) -> None:
+            if frame == page.main_frame:
+                _forget_panel_open(page)
+        
+        def on_close(_page) -> None:
+            _panel_open.pop(page, None)
+        
+        page.on("framenavigated", on_navigated)
+        page.on("close", on_close)
+    _panel_open[page] = True
+
+
+def _forget_panel_open(page: Page) -> None:
+    """Re-verify the People panel on the next extraction for this page."""
+    if page in _panel_open:
+        _panel_open[page] = False
+
+
 class RobustParticipantExtractor:
     """Robust participant extraction using multiple methods with proper filtering."""
     
@@ -172,72 +509,52 @@ class RobustParticipantExtractor:
         CRITICAL: Uses proper filtering to exclude UI elements.
         ENHANCED: Better "(You)" and self-indicator detection.
         """
-        all_participants = []
-        seen_names: Set[str] = set()
+        # Keyed by lower-cased name: insertion dedupes and keeps method priority order
+        participants: Dict[str, Dict] = {}
         
         logger.info("Starting ROBUST participant extraction with enhanced bot detection")
         
-        # CRITICAL: First check participant badge count (shows actual count)
-        badge_count = await self._get_participant_badge_count(page)
-        logger.info(f"Participant badge count: {badge_count}")
-        
         # Ensure People panel is open before extraction
         await self._ensure_people_panel_open(page)
-        await page.wait_for_timeout(2000)  # Wait for panel to fully load
+        try:
+            # Wait for panel to load; returns at once when rows are already rendered
+            await page.wait_for_selector(_PANEL_ROWS_SEL, timeout=3000)
+        except Exception:
+            pass
         
         # Method 1: JavaScript-based extraction (most reliable for Google Meet)
-        # This directly queries the DOM structure of Google Meet
-        js_participants = await self._extract_via_javascript(page)
-        for p in js_participants:
-            name = p.get("name", "").strip()
-            if name and name.lower() not in seen_names:
-                # Double-check with our filter
-                if not is_ui_element(name):
-                    all_participants.append(p)
-                    seen_names.add(name.lower())
-                    
-                    # Track detected bot name
-                    if p.get("is_bot", False) and not self._detected_bot_name:
-                        self._detected_bot_name = name
-                        logger.info(f"Detected bot name: {name}")
-                    
-                    logger.debug(f"JS extraction: Added valid participant '{name}' (is_bot: {p.get('is_bot', False)})")
-                else:
-                    logger.debug(f"JS extraction: Filtered out UI element '{name}'")
-        
-        # Method 2: DOM selectors (data-self-name) - backup
-        if len(all_participants) < badge_count:
-            dom_participants = await self._extract_via_dom_selectors(page)
-            for p in dom_participants:
-                name = p.get("name", "").strip()
-                if name and name.lower() not in seen_names:
-                    if not is_ui_element(name):
-                        all_participants.append(p)
-                        seen_names.add(name.lower())
-                        
-                        if p.get("is_bot", False) and not self._detected_bot_name:
-                            self._detected_bot_name = name
-                        
-                        logger.debug(f"DOM extraction: Added valid participant '{name}'")
-                    else:
-                        logger.debug(f"DOM extraction: Filtered out UI element '{name}'")
-        
-        # Method 3: Panel text extraction - last resort
-        if len(all_participants) < badge_count:
-            panel_participants = await self._extract_via_panel_text(page)
-            for p in panel_participants:
-                name = p.get("name", "").strip()
-                if name and name.lower() not in seen_names:
-                    if not is_ui_element(name):
-                        all_participants.append(p)
-                        seen_names.add(name.lower())
-                        
-                        if p.get("is_bot", False) and not self._detected_bot_name:
-                            self._detected_bot_name = name
-                        
-                        logger.debug(f"Panel extraction: Added valid participant '{name}'")
-                    else:
-                        logger.debug(f"Panel extraction: Filtered out UI element '{name}'")
+        # This directly queries the DOM structure of Google Meet, and in the same
+        # round trip reads the participant badge count (shows actual count) and,
+        # when it came up short, the rows Methods 2 and 3 parse
+        badge_count, js_participants, fallback_rows = await self._extract_via_javascript(page)
+        logger.info(f"Participant badge count: {badge_count}")
+        self._merge_participants(participants, js_participants, "JS")
+        
+        if len(participants) >= badge_count:
+            logger.debug(f"JS extraction met badge count ({badge_count}), skipping fallbacks")
+        else:
+            if fallback_rows is None:
+                # Python filtering dropped names the JS pass kept; fetch the rows now
+                try:
+                    fallback_rows = await page.evaluate(_FALLBACK_ROWS_JS)
+                except Exception as e:
+                    logger.debug(f"Fallback rows read failed: {e}")
+            fallback_rows = fallback_rows or {}
+            
+            # Method 2: DOM selectors (data-self-name) - backup
+            dom_participants = self._extract_via_dom_selectors(fallback_rows.get("dom", []))
+            self._merge_participants(participants, dom_participants, "DOM")
+            
+            # Method 3: Panel text extraction - last resort
+            if len(participants) < badge_count:
+                panel_participants = self._extract_via_panel_text(fallback_rows.get("panel", []))
+                self._merge_participants(participants, panel_participants, "Panel")
+        
+        all_participants = list(participants.values())
+        
+        # Nothing found: re-verify the People panel on the next extraction
+        if not all_participants:
+            _forget_panel_open(page)
         
         # CRITICAL: If we extracted fewer than badge count, don't false-positive empty meeting
         if len(all_participants) == 0 and badge_count > 0:
@@ -275,281 +592,54 @@ class RobustParticipantExtractor:
         
         return all_participants
     
+    def _merge_participants(self, participants: Dict[str, Dict], candidates: List[Dict], source: str):
+        """Add candidates whose lower-cased name is not yet in participants, skipping UI elements."""
+        for p in candidates:
+            name = p.get("name", "").strip()
+            if not name:
+                continue
+            key = name.lower()
+            if key in participants:
+                continue
+            # Double-check with our filter
+            if is_ui_element(name):
+                logger.debug(f"{source} extraction: Filtered out UI element '{name}'")
+                continue
+            participants[key] = p
+            
+            # Track detected bot name
+            if p.get("is_bot", False) and not self._detected_bot_name:
+                self._detected_bot_name = name
+                logger.info(f"Detected bot name: {name}")
+            
+            logger.debug(f"{source} extraction: Added valid participant '{name}' (is_bot: {p.get('is_bot', False)})")
+    
     def get_detected_bot_name(self) -> Optional[str]:
         """Return the detected bot name (the participant with '(You)' suffix)."""
         return self._detected_bot_name
     
-    async def _get_participant_badge_count(self, page: Page) -> int:
-        """
-        Get participant count from the badge/button.
-        
-        This is CRITICAL - the badge shows the actual count even if extraction fails.
-        """
-        try:
-            # Use JavaScript to find badge count (most reliable)
-            badge_count = await page.evaluate("""
-            (() => {
-                try {
-                    // Method 1: Look for People button with badge number
-                    const buttons = document.querySelectorAll('button');
-                    for (let btn of buttons) {
-                        const ariaLabel = (btn.getAttribute('aria-label') || '').toLowerCase();
-                        if (ariaLabel.includes('people') || ariaLabel.includes('show everyone') || ariaLabel.includes('participant')) {
-                            // Check for badge number in button content
-                            const spans = btn.querySelectorAll('span, div');
-                            for (let span of spans) {
-                                const text = (span.textContent || '').trim();
-                                if (/^\\d+$/.test(text)) {
-                                    return parseInt(text);
-                                }
-                            }
-                            // Check aria-label for number
-                            const match = ariaLabel.match(/(\\d+)/);
-                            if (match) {
-                                return parseInt(match[1]);
-                            }
-                        }
-                    }
-                    
-                    // Method 2: Look for any element with participant count
-                    const countElements = document.querySelectorAll('[data-participant-count]');
-                    for (let el of countElements) {
-                        const count = el.getAttribute('data-participant-count');
-                        if (count) {
-                            return parseInt(count);
-                        }
-                    }
-                    
-                    // Method 3: Look for "X in call" or similar text
-                    const allText = document.body.innerText || '';
-                    const inCallMatch = allText.match(/(\\d+)\\s*(?:in\\s*(?:the\\s*)?(?:call|meeting))/i);
-                    if (inCallMatch) {
-                        return parseInt(inCallMatch[1]);
-                    }
-                    
-                } catch (e) {
-                    console.error('Badge count error:', e);
-                }
-                return 0;
-            })()
-            """)
-            
-            if badge_count and badge_count > 0:
-                return badge_count
-                
-        except Exception as e:
-            logger.debug(f"Could not get badge count: {e}")
-        
-        return 0
-    
-    async def _extract_via_javascript(self, page: Page) -> List[Dict]:
+    async def _extract_via_javascript(self, page: Page) -> Tuple[int, List[Dict], Optional[Dict]]:
         """
         Extract participants using JavaScript evaluation - most reliable for Google Meet.
         
         CRITICAL: This targets the SPECIFIC DOM structure of Google Meet's People panel.
         ENHANCED: Better detection of "(You)" suffix and self-indicators.
+        
+        The same evaluate also reads the participant badge count (0 if not found)
+        and, when fewer participants than that were found, the fallback rows
+        (see _FALLBACK_ROWS_JS); both are returned alongside the participants.
         """
+        badge_count = 0
         participants = []
+        fallback_rows = None
         
         try:
-            # Comprehensive JavaScript to extract real participants with enhanced bot detection
-            js_code = """
-            (() => {
-                const participants = [];
-                const seen = new Set();
-                
-                // Extended UI element blacklist
-                const uiBlacklist = [
-                    'backgrounds and effects', 'visual effects', 'your microphone is off',
-                    'your camera is off', 'microphone is off', 'camera is off',
-                    'you can\\'t remotely mute', 'you can\\'t unmute someone else',
-                    'can\\'t remotely mute', 'can\\'t unmute', 'turn on microphone',
-                    'turn off microphone', 'turn on camera', 'turn off camera',
-                    'mute microphone', 'unmute microphone', 'present now',
-                    'settings', 'options', 'more options', 'add people',
-                    'search for people', 'in the meeting', 'contributors',
-                    'waiting for others', 'you\\'re the only one', 'connecting',
-                    'joining', 'host controls', 'meeting details'
-                ];
-                
-                function isUIElement(text) {
-                    if (!text || text.length < 2) return true;
-                    const lower = text.toLowerCase().trim();
-                    
-                    // Check blacklist
-                    for (let item of uiBlacklist) {
-                        if (lower.includes(item)) return true;
-                    }
-                    
-                    // Starts with "your" or "you " (notifications)
-                    if (lower.startsWith('your ') || lower.startsWith('you ')) return true;
-                    
-                    // Contains can't/cannot (error messages)
-                    if (lower.includes("can't") || lower.includes('cannot')) return true;
-                    
-                    // Ends with period and is a sentence
-                    if (lower.endsWith('.') && lower.split(' ').length > 4) return true;
-                    
-                    return false;
-                }
-                
-                // ENHANCED: Check multiple indicators for "self" participant (the bot)
-                function checkIfSelf(element, name) {
-                    // Check 1: "(You)" suffix in name (case-insensitive)
-                    if (/\\(you\\)/i.test(name)) {
-                        return true;
-                    }
-                    
-                    // Check 2: Element has specific self-indicator classes
-                    const classList = Array.from(element.classList || []).join(' ').toLowerCase();
-                    if (classList.includes('self') || classList.includes('local') || classList.includes('me')) {
-                        return true;
-                    }
-                    
-                    // Check 3: Look for "You" label inside the element
-                    const youLabels = element.querySelectorAll('[data-self-name*="(You)"], [data-self-name*="(you)"]');
-                    if (youLabels.length > 0) {
-                        return true;
-                    }
-                    
-                    // Check 4: Check for aria-label containing "you"
-                    const ariaLabel = (element.getAttribute('aria-label') || '').toLowerCase();
-                    if (ariaLabel.includes('(you)') || ariaLabel === 'you') {
-                        return true;
-                    }
-                    
-                    // Check 5: Check for mute/unmute controls specific to self
-                    // Self participants often have "Mute microphone" instead of "Mute [Name]"
-                    const muteBtn = element.querySelector('[aria-label*="Mute microphone" i], [aria-label*="Turn off microphone" i]');
-                    if (muteBtn) {
-                        return true;
-                    }
-                    
-                    // Check 6: Look for pin/unpin self button
-                    const pinSelfBtn = element.querySelector('[aria-label*="Pin yourself" i], [aria-label*="Unpin yourself" i]');
-                    if (pinSelfBtn) {
-                        return true;
-                    }
-                    
-                    // Check 7: Look for text content indicating self
-                    const innerText = (element.innerText || '').toLowerCase();
-                    if (innerText.includes('(you)')) {
-                        return true;
-                    }
-                    
-                    return false;
-                }
-                
-                function extractName(element) {
-                    // Method 1: data-self-name attribute (most reliable)
-                    const selfNameEl = element.querySelector('[data-self-name]');
-                    if (selfNameEl) {
-                        return selfNameEl.getAttribute('data-self-name');
-                    }
-                    
-                    // Method 2: Look for span with dir="auto" containing the name
-                    const spans = element.querySelectorAll('span[dir="auto"], div[dir="auto"]');
-                    for (let span of spans) {
-                        const text = (span.textContent || '').trim();
-                        if (text && text.length > 1 && text.length < 100 && !isUIElement(text)) {
-                            return text;
-                        }
-                    }
-                    
-                    // Method 3: First line of text (careful filtering)
-                    const fullText = element.innerText || '';
-                    const lines = fullText.split('\\n').map(l => l.trim()).filter(l => l.length > 1);
-                    for (let line of lines) {
-                        if (!isUIElement(line) && line.length < 100) {
-                            return line;
-                        }
-                    }
-                    
-                    return null;
-                }
-                
-                try {
-                    // Strategy 1: Find Contributors section and get list items
-                    const listItems = document.querySelectorAll('[role="listitem"]');
-                    
-                    for (let item of listItems) {
-                        const name = extractName(item);
-                        if (name && !isUIElement(name)) {
-                            const nameLower = name.toLowerCase().replace(/\\s*\\(you\\)$/i, '').trim().toLowerCase();
-                            
-                            if (!seen.has(nameLower)) {
-                                seen.add(nameLower);
-                                
-                                // ENHANCED: Use multiple methods to detect if this is the bot
-                                let isBot = checkIfSelf(item, name);
-                                
-                                // Clean the name - remove (You) suffix
-                                let cleanName = name.trim();
-                                const youPattern = /\\s*\\(you\\)$/i;
-                                if (youPattern.test(cleanName)) {
-                                    cleanName = cleanName.replace(youPattern, '').trim();
-                                    isBot = true;  // Definitely the bot if has (You)
-                                }
-                                
-                                if (cleanName.length > 1) {
-                                    participants.push({
-                                        name: cleanName,
-                                        originalName: name,
-                                        isBot: isBot,
-                                        source: 'listitem'
-                                    });
-                                }
-                            }
-                        }
-                    }
-                    
-                    // Strategy 2: Direct data-self-name search (backup)
-                    if (participants.length === 0) {
-                        const nameElements = document.querySelectorAll('[data-self-name]');
-                        for (let el of nameElements) {
-                            const name = el.getAttribute('data-self-name');
-                            if (name && !isUIElement(name)) {
-                                const listItem = el.closest('[role="listitem"]');
-                                if (listItem) {
-                                    const nameLower = name.toLowerCase().replace(/\\s*\\(you\\)$/i, '').trim().toLowerCase();
-                                    
-                                    if (!seen.has(nameLower)) {
-                                        seen.add(nameLower);
-                                        
-                                        let isBot = checkIfSelf(listItem, name);
-                                        
-                                        let cleanName = name.trim();
-                                        const youPattern = /\\s*\\(you\\)$/i;
-                                        if (youPattern.test(cleanName)) {
-                                            cleanName = cleanName.replace(youPattern, '').trim();
-                                            isBot = true;
-                                        }
-                                        
-                                        if (cleanName.length > 1) {
-                                            participants.push({
-                                                name: cleanName,
-                                                originalName: name,
-                                                isBot: isBot,
-                                                source: 'data-self-name'
-                                            });
-                                        }
-                                    }
-                                }
-                            }
-                        }
-                    }
-                    
-                } catch (e) {
-                    console.error('JS extraction error:', e);
-                }
-                
-                return participants;
-            })()
-            """
-            
-            result = await page.evaluate(js_code)
+            result = await page.evaluate(_EXTRACT_JS)
+            badge = result.get("badgeCount")
+            badge_count = badge if isinstance(badge, int) and badge > 0 else 0
+            fallback_rows = result.get("fallbackRows")
             
-            for item in result:
+            for item in result.get("participants", []):
                 name = item.get("name", "")
                 original_name = item.get("originalName", name)
                 is_bot = item.get("isBot", False)
@@ -571,105 +661,65 @@ class RobustParticipantExtractor:
         except Exception as e:
             logger.warning(f"JavaScript extraction failed: {e}", exc_info=True)
         
-        return participants
+        return badge_count, participants, fallback_rows
     
-    async def _extract_via_dom_selectors(self, page: Page) -> List[Dict]:
-        """Extract using DOM selectors - backup method with enhanced bot detection."""
+    def _extract_via_dom_selectors(self, elements: List[Dict]) -> List[Dict]:
+        """Extract from data-self-name rows - backup method with enhanced bot detection."""
         participants = []
         
         try:
-            # Find all elements with data-self-name attribute
-            elements = await page.query_selector_all('[data-self-name]')
-            
+            # Every data-self-name inside (or on) a list item, with its DOM self
+            # indicators; the selector did the list-item context check
             for element in elements:
-                try:
-                    name = await element.get_attribute("data-self-name")
-                    if not name or not name.strip():
-                        continue
-                    
-                    # Validate it's a real participant
-                    if is_ui_element(name):
-                        logger.debug(f"DOM: Skipping UI element '{name}'")
-                        continue
-                    
-                    # Check if it's in a list item context
-                    is_in_listitem = await element.evaluate("""
-                        el => {
-                            const listItem = el.closest('[role="listitem"]');
-                            return listItem !== null;
-                        }
-                    """)
-                    
-                    if not is_in_listitem:
-                        logger.debug(f"DOM: Skipping '{name}' - not in listitem")
-                        continue
-                    
-                    # Clean the name
-                    original_name = name.strip()
-                    clean_name = original_name
-                    is_bot = False
-                    
-                    # Check for (You) suffix
-                    you_pattern = re.compile(r'\s*\(you\)$', re.IGNORECASE)
-                    if you_pattern.search(clean_name):
-                        clean_name = you_pattern.sub('', clean_name).strip()
-                        is_bot = True
-                    
-                    # ENHANCED: Additional bot detection via DOM
-                    if not is_bot:
-                        is_bot = await element.evaluate("""
-                            el => {
-                                const listItem = el.closest('[role="listitem"]');
-                                if (!listItem) return false;
-                                
-                                // Check for self-mute controls
-                                const muteBtn = listItem.querySelector('[aria-label*="Mute microphone" i], [aria-label*="Turn off microphone" i]');
-                                if (muteBtn) return true;
-                                
-                                // Check inner text for (You)
-                                const innerText = (listItem.innerText || '').toLowerCase();
-                                if (innerText.includes('(you)')) return true;
-                                
-                                // Check for self classes
-                                const classList = Array.from(listItem.classList || []).join(' ').toLowerCase();
-                                if (classList.includes('self') || classList.includes('local')) return true;
-                                
-                                return false;
-                            }
-                        """)
-                    
-                    if clean_name and len(clean_name) > 1:
-                        participants.append({
-                            "name": clean_name,
-                            "role": "guest",
-                            "is_speaking": False,
-                            "is_bot": is_bot,
-                            "original_name": original_name,
-                        })
-                        logger.debug(f"DOM: Added '{clean_name}' (is_bot: {is_bot})")
-                        
-                except Exception as e:
-                    logger.debug(f"DOM: Error processing element: {e}")
+                name = element["name"]
+                if not name or not name.strip():
+                    continue
+                
+                # Validate it's a real participant
+                if is_ui_element(name):
+                    logger.debug(f"DOM: Skipping UI element '{name}'")
                     continue
+                
+                # Clean the name
+                original_name = name.strip()
+                clean_name = original_name
+                is_bot = False
+                
+                # Check for (You) suffix; one subn both strips and detects it
+                stripped, you_count = _YOU_SUFFIX_RE.subn('', clean_name)
+                if you_count:
+                    clean_name = stripped.strip()
+                    is_bot = True
+                
+                # ENHANCED: Additional bot detection via DOM
+                if not is_bot:
+                    is_bot = element["looks_like_self"]
+                
+                if clean_name and len(clean_name) > 1:
+                    participants.append({
+                        "name": clean_name,
+                        "role": "guest",
+                        "is_speaking": False,
+                        "is_bot": is_bot,
+                        "original_name": original_name,
+                    })
+                    logger.debug(f"DOM: Added '{clean_name}' (is_bot: {is_bot})")
                     
         except Exception as e:
             logger.debug(f"DOM selector extraction failed: {e}")
         
         return participants
     
-    async def _extract_via_panel_text(self, page: Page) -> List[Dict]:
-        """Extract by reading People panel text - with strict filtering and enhanced bot detection."""
+    def _extract_via_panel_text(self, list_items: List[Dict]) -> List[Dict]:
+        """Extract from People panel list item text - with strict filtering and enhanced bot detection."""
         participants = []
         seen_names = set()
         
         try:
-            # Find participant list items
-            list_items = await page.query_selector_all('[role="listitem"]')
-            
             for item in list_items:
                 try:
                     # Get text content
-                    text = await item.inner_text()
+                    text = item["text"]
                     if not text or len(text.strip()) < 2:
                         continue
                     
@@ -679,18 +729,12 @@ class RobustParticipantExtractor:
                         continue
                     
                     # Try to find the actual name
-                    name = None
-                    
                     # Method 1: data-self-name attribute
-                    name_el = await item.query_selector('[data-self-name]')
-                    if name_el:
-                        name = await name_el.get_attribute("data-self-name")
+                    name = item["self_name"]
                     
                     # Method 2: span with dir="auto"
                     if not name:
-                        name_el = await item.query_selector('span[dir="auto"], div[dir="auto"]')
-                        if name_el:
-                            name = await name_el.inner_text()
+                        name = item["auto_dir_text"]
                     
                     # Method 3: First line of text (very careful)
                     if not name:
@@ -710,10 +754,10 @@ class RobustParticipantExtractor:
                         clean_name = original_name
                         is_bot = False
                         
-                        # Check for (You) suffix
-                        you_pattern = re.compile(r'\s*\(you\)$', re.IGNORECASE)
-                        if you_pattern.search(clean_name):
-                            clean_name = you_pattern.sub('', clean_name).strip()
+                        # Check for (You) suffix; one subn both strips and detects it
+                        stripped, you_count = _YOU_SUFFIX_RE.subn('', clean_name)
+                        if you_count:
+                            clean_name = stripped.strip()
                             is_bot = True
                         
                         # ENHANCED: Check for other self indicators in text
@@ -746,39 +790,25 @@ class RobustParticipantExtractor:
     
     async def _ensure_people_panel_open(self, page: Page) -> None:
         """Ensure People panel is open - with multiple attempts."""
+        if _panel_open.get(page):
+            return
+        
         try:
             # Check if panel is already open
-            panel_selectors = [
-                '[aria-label*="People" i][role="dialog"]',
-                '[aria-label*="Show everyone" i]',
-                '[role="dialog"]:has([role="list"])',
-            ]
-            
-            for selector in panel_selectors:
-                try:
-                    panel = await page.query_selector(f'{selector}:visible')
-                    if panel:
-                        logger.debug("People panel already open")
-                        return
-                except Exception:
-                    continue
+            panel = await page.query_selector(_PANEL_OPEN_SEL)
+            if panel:
+                logger.debug("People panel already open")
+                _remember_panel_open(page)
+                return
             
             # Try to open People panel
-            button_selectors = [
-                '[aria-label*="Show everyone" i]',
-                '[aria-label*="People" i]',
-                'button[aria-label*="People" i]',
-                'button[data-tooltip*="People" i]',
-                '[data-tooltip*="Show everyone" i]',
-            ]
-            
-            for selector in button_selectors:
+            for selector in _PEOPLE_BUTTON_SELECTORS:
                 try:
                     button = await page.query_selector(selector)
                     if button:
                         await button.click()
-                        await page.wait_for_timeout(1500)
                         logger.info(f"Opened People panel via: {selector}")
+                        _remember_panel_open(page)
                         return
                 except Exception:
                     continue
@@ -787,3 +817,4 @@ class RobustParticipantExtractor:
                     
         except Exception as e:
             logger.debug(f"Error opening People panel: {e}")
+
@@ -3,6 +3,7 @@ Filter out UI elements and notifications from participant names.
 
 Google Meet shows various UI notifications that should not be treated as participants.
 """
+from functools import lru_cache
 from typing import Optional
 
 
@@ -220,3 +221,9 @@ def clean_participant_name(name: str) -> Optional[str]:
         return cleaned
     
     return None
+
+
+# The same raw names recur on every poll and across summaries, and both
+# filters are pure, so callers on hot paths use these memoized versions.
+clean_participant_name_cached = lru_cache(maxsize=4096)(clean_participant_name)
+is_valid_participant_name_cached = lru_cache(maxsize=4096)(is_valid_participant_name)
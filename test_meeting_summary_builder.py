@@ -0,0 +1,150 @@
+"""
+Unit tests for the meeting summary builder.
+
+Covers:
+1. Participant durations from ISO strings and datetime timestamps
+2. Unparseable timestamps (no duration, no crash)
+3. "(You)" suffix variants and bot detection
+4. Fallback to the original name when the display name fails cleaning
+
+Runs under pytest, or directly: python test_meeting_summary_builder.py
+"""
+import os
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+from src.config import get_settings
+from src.meeting_summary_builder import MeetingSummaryBuilder, build_summary
+
+
+@contextmanager
+def bot_identity(display_name="Meeting Bot", profile_name=None):
+    """Temporarily set the bot identity env vars that get_settings() reads (clearing its cache)."""
+    saved = {key: os.environ.get(key) for key in ("BOT_DISPLAY_NAME", "BOT_GOOGLE_PROFILE_NAME")}
+    os.environ["BOT_DISPLAY_NAME"] = display_name
+    if profile_name is None:
+        os.environ.pop("BOT_GOOGLE_PROFILE_NAME", None)
+    else:
+        os.environ["BOT_GOOGLE_PROFILE_NAME"] = profile_name
+    get_settings.cache_clear()
+    try:
+        yield
+    finally:
+        for key, value in saved.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+        get_settings.cache_clear()
+
+
+def _participants(history, session_data=None):
+    with bot_identity():
+        summary = build_summary(session_data or {"meeting_id": "m1"}, history, 0)
+    return {p["original_name"]: p for p in summary["participants"]}
+
+
+def test_duration_from_iso_strings():
+    """ISO-8601 strings, with "Z" or an explicit offset, give a duration."""
+    participants = _participants({
+        "Alice": {"name": "Alice", "join_time": "2024-01-01T00:00:00Z", "leave_time": "2024-01-01T00:10:00Z"},
+        "Bob": {"name": "Bob", "join_time": "2024-01-01T00:00:00+00:00", "leave_time": "2024-01-01T00:00:30+00:00"},
+    })
+    assert participants["Alice"]["duration_seconds"] == 600
+    assert participants["Bob"]["duration_seconds"] == 30
+
+
+def test_duration_from_datetimes():
+    """Datetime timestamps are used as-is, alone or mixed with ISO strings."""
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    participants = _participants({
+        "Alice": {"name": "Alice", "join_time": start, "leave_time": datetime(2024, 1, 1, 0, 0, 45, tzinfo=timezone.utc)},
+        "Bob": {"name": "Bob", "join_time": start, "leave_time": "2024-01-01T00:10:00Z"},
+    })
+    assert participants["Alice"]["duration_seconds"] == 45
+    assert participants["Bob"]["duration_seconds"] == 600
+    # Timestamps are passed through untouched
+    assert participants["Alice"]["join_time"] is start
+
+
+def test_unparseable_timestamps_skip_duration():
+    """Bad timestamps keep the participant but leave out duration_seconds."""
+    participants = _participants({
+        "Alice": {"name": "Alice", "join_time": "garbage", "leave_time": "2024-01-01T00:10:00Z"},
+        "Bob": {"name": "Bob", "join_time": 123, "leave_time": 456},
+        "Carol": {"name": "Carol", "join_time": "2024-01-01T00:00:00Z"},
+    })
+    for name in ("Alice", "Bob", "Carol"):
+        assert name in participants
+        assert "duration_seconds" not in participants[name]
+
+
+def test_you_suffix_variants_mark_bot():
+    """Any "(You)" tag in the original name marks the bot, whatever its case or spacing."""
+    for raw in ("Snehil (You)", "Snehil (you)", "Snehil (YOU) ", "Snehil(You)"):
+        participants = _participants({raw: {"name": raw, "original_name": raw}})
+        assert participants[raw]["is_bot"] is True, raw
+
+
+def test_you_suffix_stripped_from_display_name():
+    """The standard " (You)" suffix is dropped from the displayed name."""
+    participants = _participants({"Snehil (You)": {"name": "Snehil (You)", "original_name": "Snehil (You)"}})
+    record = participants["Snehil (You)"]
+    assert record["name"] == "Snehil"
+    assert record["is_bot"] is True
+
+
+def test_fallback_to_original_name_strips_you_suffix():
+    """An invalid display name falls back to the original name minus any "(you)" suffix."""
+    participants = _participants({"x": {"name": "", "original_name": "Dana (you)  "}})
+    record = participants["Dana (you)  "]
+    assert record["name"] == "Dana"
+    assert record["is_bot"] is True
+
+
+def test_invalid_name_without_alternative_is_dropped():
+    """A UI element whose original name is the same string is dropped, bot tag or not."""
+    participants = _participants({
+        "Settings": {"name": "Settings"},
+        "Settings (You)": {"name": "Settings (You)", "original_name": "Settings (You)"},
+        "Alice": {"name": "Alice"},
+    })
+    assert list(participants) == ["Alice"]
+
+
+def test_bot_excluded_from_real_participants():
+    """Bots stay in participants but not in real_participants or the unique count."""
+    history = {
+        "Meeting Bot": {"name": "Meeting Bot"},
+        "Carol": {"name": "Carol"},
+        "Alice": {"name": "Alice"},
+    }
+    with bot_identity():
+        summary = MeetingSummaryBuilder.build_summary({"bot_name_detected": "CAROL"}, history, 2)
+    assert [p["name"] for p in summary["participants"]] == ["Meeting Bot", "Carol", "Alice"]
+    assert [p["name"] for p in summary["real_participants"]] == ["Alice"]
+    assert summary["unique_participants"] == 1
+
+
+def test_bot_identity_change_is_picked_up():
+    """A new bot identity from settings applies on the next summary; the builder adds no cache of its own."""
+    history = {"Recorder": {"name": "Recorder"}, "Alice": {"name": "Alice"}}
+    with bot_identity("Meeting Bot"):
+        before = build_summary({}, history, 0)
+    with bot_identity("Recorder"):
+        after = build_summary({}, history, 0)
+    assert [p["name"] for p in before["real_participants"]] == ["Recorder", "Alice"]
+    assert [p["name"] for p in after["real_participants"]] == ["Alice"]
+
+
+def main():
+    """Run all tests without pytest."""
+    tests = [value for name, value in globals().items() if name.startswith("test_") and callable(value)]
+    for test in tests:
+        test()
+        print(f"  ✅ {test.__name__}")
+    print(f"\n{len(tests)} tests passed")
+
+
+if __name__ == "__main__":
+    main()